@@ -0,0 +1,365 @@
+import argparse
+import time
+import logging
+import tracemalloc
+
+logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
+
+
+def bench_streaming(args):
+    from src.data.client import NFLVerseClient
+    from src.models.streaming import train_history
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    models, summary = train_history(NFLVerseClient(), end_season=args.end, start_season=args.start)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print("=== STREAMING MULTI-SEASON TRAINING ===")
+    print(f"Seasons:            {summary['first_season']}-{summary['last_season']} ({summary['seasons']})")
+    print(f"Games:              {summary['games']:,}")
+    print(f"Train throughput:   {summary['games_per_second']:,.0f} games/s")
+    print(f"End-to-end:         {summary['games'] / elapsed:,.0f} games/s ({elapsed:.2f} s incl. loading)")
+    print(f"Peak traced memory: {peak / 1024 / 1024:.1f} MiB")
+
+    elo = models['elo']
+    top = sorted(elo.ratings.items(), key=lambda x: -x[1])[:5]
+    print("Top Elo: " + ", ".join(f"{t} {r:.0f}" for t, r in top))
+
+
+def bench_teardown(args):
+    from src.data import storage
+    from src.simulation.backtest import BACKTEST_CONFIGS, run_prediction_table
+    from src.simulation.teardown import teardown_tables
+
+    seasons = args.seasons or storage.available_seasons()
+    start = time.perf_counter()
+    df = run_prediction_table(seasons, [BACKTEST_CONFIGS[args.config]])
+    backtest_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        tables = teardown_tables(df)
+    elapsed = (time.perf_counter() - start) / args.repeat
+
+    print("=== ERROR TEARDOWN ===")
+    print(f"Seasons:            {', '.join(str(s) for s in seasons)}")
+    print(f"Predictions:        {len(df):,} ({backtest_elapsed:.2f} s backtest incl. cache)")
+    print(f"Teardown pass:      {elapsed * 1000:.1f} ms ({len(df) / elapsed:,.0f} games/s)")
+    for name, table in tables.items():
+        print(f"  {name:<20} {len(table):>6} rows")
+
+
+def bench_storage(args):
+    import os
+    import pandas as pd
+    from src.data import storage, shared
+    from src.data.client import NFLVerseClient, SCHEDULE_TABLE
+
+    seasons = args.seasons or storage.available_seasons()
+    client = NFLVerseClient()
+    client.get_schedule_table(seasons)
+    for season in seasons:
+        for ext in ('parquet', 'npz'):
+            if storage.is_stale(f"schedules_{season}.{ext}", f"schedules_nflverse_{season}.json"):
+                storage.save_table(f"schedules_{season}.{ext}", storage.load_table(SCHEDULE_TABLE.format(season)))
+
+    formats = {
+        'json': (lambda s: f"schedules_nflverse_{s}.json", False,
+                 lambda name: pd.DataFrame(storage.load_json(name))),
+        'parquet': (lambda s: f"schedules_{s}.parquet", True, storage.load_table),
+        'npz': (lambda s: f"schedules_{s}.npz", True, storage.load_table),
+        'arrow': (lambda s: SCHEDULE_TABLE.format(s), True, storage.load_table),
+    }
+
+    print("=== SCHEDULE STORAGE ===")
+    print(f"Seasons:            {', '.join(str(s) for s in seasons)}")
+    baseline = None
+    for fmt, (name_of, processed, load) in formats.items():
+        names = [name_of(s) for s in seasons]
+        size = sum(os.path.getsize(storage.get_file_path(n, processed)) for n in names)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            df = pd.concat([load(n) for n in names], ignore_index=True)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        baseline = baseline or elapsed
+        print(f"  {fmt:<8} {len(df):>6} games  {elapsed * 1000:>8.1f} ms  {size / 1024:>8.1f} KiB  "
+              f"{baseline / elapsed:>5.1f}x")
+
+    paths = {
+        'json': lambda: [shared.table_columns(storage.load_json(f"schedules_nflverse_{s}.json", use_cache=False)) for s in seasons],
+        'json (memo)': lambda: [shared.table_columns(client.get_schedules(s)) for s in seasons],
+        'arrow': lambda: [client.schedule_columns(s) for s in seasons],
+    }
+    print("Schedule columns published to backtest workers:")
+    baseline = None
+    for name, load in paths.items():
+        load()
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            load()
+        elapsed = (time.perf_counter() - start) / args.repeat
+        baseline = baseline or elapsed
+        print(f"  {name:<12} {elapsed * 1000:>8.2f} ms  {baseline / elapsed:>5.1f}x")
+
+
+def bench_ingest(args):
+    from src.data import storage
+    from src.data.client import NFLVerseClient
+    from src.data.sources import FixtureSource
+
+    client = NFLVerseClient(source=FixtureSource(args.fixtures) if args.fixtures else None)
+    seasons = args.seasons or storage.available_seasons()
+
+    start = time.perf_counter()
+    df = client.get_schedules_many(seasons, max_workers=args.workers)
+    first = time.perf_counter() - start
+
+    timings = {}
+    for label, workers in (('serial', 1), ('threaded', args.workers)):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            df = client.get_schedules_many(seasons, max_workers=workers)
+        timings[label] = (time.perf_counter() - start) / args.repeat
+
+    print("=== MULTI-SEASON INGESTION ===")
+    print(f"Seasons:            {len(seasons)} ({min(seasons)}-{max(seasons)})" if seasons else "Seasons:            none")
+    print(f"Source:             {'fixtures in ' + args.fixtures if args.fixtures else 'nfl_data_py'} (only for uncached seasons)")
+    print(f"Games:              {len(df):,}")
+    print(f"First load:         {first * 1000:.1f} ms (fetches and columnar copies as needed)")
+    for label, elapsed in timings.items():
+        print(f"Cached, {label + ':':<11} {elapsed * 1000:.1f} ms ({len(df) / elapsed:,.0f} games/s)")
+
+
+def _synthetic_nflverse(seasons, players_per_team=12, seed=0):
+    import numpy as np
+    import pandas as pd
+    from src.data import storage
+
+    rng = np.random.default_rng(seed)
+    base = pd.DataFrame(storage.load_json(f"schedules_nflverse_{storage.available_seasons()[-1]}.json"))
+    teams = sorted(set(base['HomeTeam']))
+    schedules, weekly = {}, {}
+    for season in seasons:
+        final = rng.random(len(base)) < 0.95
+        home = np.where(final, base['HomeScore'], np.nan)
+        away = np.where(final, base['AwayScore'], np.nan)
+        schedules[season] = pd.DataFrame({
+            'game_id': [f"{season}_{k.split('_', 1)[1]}" for k in base['GameKey']],
+            'season': season, 'game_type': 'REG', 'week': base['Week'], 'gameday': base['Date'],
+            'home_team': base['HomeTeam'], 'away_team': base['AwayTeam'], 'home_score': home, 'away_score': away,
+            'result': home - away, 'home_rest': base['HomeRest'], 'away_rest': base['AwayRest'],
+            'spread_line': -base['spread_line'], 'home_qb_name': base['home_qb_name'], 'away_qb_name': base['away_qb_name'],
+        })
+        n = len(teams) * 18 * players_per_team
+        weekly[season] = pd.DataFrame({
+            'season': season,
+            'week': np.repeat(np.arange(1, 19), len(teams) * players_per_team),
+            'recent_team': np.tile(np.repeat(teams, players_per_team), 18),
+            'interceptions': rng.integers(0, 2, n).astype(float),
+            'rushing_fumbles_lost': rng.integers(0, 2, n).astype(float),
+            'receiving_fumbles_lost': rng.integers(0, 2, n).astype(float),
+            'sack_fumbles_lost': rng.integers(0, 2, n).astype(float),
+            'rushing_yards': rng.normal(10, 15, n).round(),
+            'passing_yards': rng.normal(20, 60, n).round(),
+            'rushing_epa': rng.normal(0, 1, n),
+            'passing_epa': rng.normal(0, 2, n),
+        })
+    return schedules, weekly
+
+
+def bench_transform(args):
+    from src.data.client import NFLVerseClient
+    from src.data.sources import FrameSource
+
+    seasons = list(range(2025 - args.seasons + 1, 2026))
+    schedules, weekly = _synthetic_nflverse(seasons)
+    client = NFLVerseClient(source=FrameSource(schedules, weekly))
+
+    start = time.perf_counter()
+    games = 0
+    for _ in range(args.repeat):
+        for season in seasons:
+            games += len(client._schedule_table(client._schedule_frame(season), season))
+    elapsed = time.perf_counter() - start
+
+    print("=== SCHEDULE INGESTION TRANSFORM ===")
+    print(f"Seasons:            {len(seasons)} ({seasons[0]}-{seasons[-1]}), synthetic nflverse frames")
+    print(f"Player rows/season: {len(weekly[seasons[0]]):,}")
+    print(f"Per season:         {elapsed / (args.repeat * len(seasons)) * 1000:.2f} ms")
+    print(f"Throughput:         {games / elapsed:,.0f} games/s")
+
+
+def _synthetic_pbp(path, season, plays=50000, seed=0):
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    teams = np.array([f"T{i:02d}" for i in range(32)])
+    offense = rng.integers(0, 32, plays)
+    pd.DataFrame({
+        'season': season,
+        'week': rng.integers(1, 19, plays),
+        'season_type': 'REG',
+        'posteam': teams[offense],
+        'defteam': teams[(offense + rng.integers(1, 32, plays)) % 32],
+        'play_type': rng.choice(['pass', 'run', 'punt', 'no_play'], plays, p=[0.55, 0.4, 0.03, 0.02]),
+        'down': rng.integers(1, 5, plays).astype(float),
+        'epa': rng.normal(0, 1.5, plays),
+        'wp': rng.random(plays),
+        'desc': 'play description ' * 4,
+    }).to_parquet(path, row_group_size=16384)
+
+
+def bench_pbp(args):
+    import os
+    import tempfile
+    from src.data import pbp
+
+    directory = args.directory
+    if directory is None:
+        directory = tempfile.mkdtemp(prefix="pbp_")
+        for season in range(2025 - args.seasons + 1, 2026):
+            _synthetic_pbp(os.path.join(directory, f"play_by_play_{season}.parquet"), season, args.plays)
+
+    print("=== PLAY-BY-PLAY INGESTION ===")
+    print(f"Source: {directory}")
+    for batch_size in args.batch_sizes:
+        tracemalloc.start()
+        start = time.perf_counter()
+        summary = pbp.ingest_pbp(directory, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        plays = sum(s['plays'] for s in summary)
+        print(f"batch {batch_size:>7,}: {len(summary)} seasons, {plays:,} plays in {elapsed:.2f}s "
+              f"({plays / elapsed:,.0f} plays/s), peak {peak / 1024 / 1024:.1f} MB")
+
+
+def bench_features(args):
+    from src.data.client import NFLVerseClient
+    from src.features.processor import FeatureProcessor
+
+    games = NFLVerseClient().get_schedule_table(args.seasons).to_dict('records')
+    weeks = sorted({(g['Season'], g['Week']) for g in games})
+    processor = FeatureProcessor()
+
+    start = time.perf_counter()
+    for season, week in weeks:
+        processor.process_team_stats([g for g in games if g['Season'] == season and g['Week'] < week], [])
+    recompute = time.perf_counter() - start
+
+    start = time.perf_counter()
+    processor.update_store(games)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for season, week in weeks:
+        processor.team_stats_as_of(season, week)
+    lookups = time.perf_counter() - start
+
+    print("=== POINT-IN-TIME TEAM FEATURES ===")
+    print(f"Weeks:               {len(weeks)} across {len(args.seasons)} seasons")
+    print(f"Recompute per week:  {recompute * 1000:.1f} ms")
+    print(f"Store build:         {build * 1000:.1f} ms")
+    print(f"As-of tables:        {lookups * 1000:.1f} ms")
+
+
+def bench_cv(args):
+    from src.data.client import NFLVerseClient
+    from src.models.validation import FeatureMatrices, season_start_drift
+
+    games = NFLVerseClient().get_schedule_table(args.seasons).to_dict('records')
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        matrices = FeatureMatrices(games)
+    elapsed = (time.perf_counter() - start) / args.repeat
+    drift = season_start_drift(games, matrices)
+
+    print("=== CROSS-VALIDATION FEATURES ===")
+    print(f"Games:               {len(matrices):,} across {len(args.seasons)} seasons")
+    print(f"Feature build:       {elapsed * 1000:.1f} ms ({len(matrices) / elapsed:,.0f} games/s)")
+    for season, diff in drift.items():
+        status = "ok" if diff < 1e-9 else "MISMATCH"
+        print(f"Week 1 {season} vs streaming: max |diff| {diff:.3g} ({status})")
+
+
+def bench_bootstrap(args):
+    from src.data.client import NFLVerseClient
+    from src.models.bootstrap import bootstrap_ratings, elo_parity
+
+    games = NFLVerseClient().get_schedule_table([args.season]).to_dict('records')
+    start = time.perf_counter()
+    bootstrap_ratings(games, n_replicates=args.replicates, seed=0)
+    elapsed = time.perf_counter() - start
+
+    print("=== BOOTSTRAP RATINGS ===")
+    print(f"Season:              {args.season} ({len(games)} games)")
+    print(f"Replicates:          {args.replicates:,} in {elapsed:.2f} s ({args.replicates / elapsed:,.0f}/s)")
+    for params in ({'k_factor': 50, 'hfa': 40}, {'base_rating': 1500, 'k_factor': 50, 'hfa': 40}):
+        diff = elo_parity(games, params)
+        status = "ok" if diff < 1e-9 else "MISMATCH"
+        print(f"Unit-weight replicate vs EloModel.train {params}: max |diff| {diff:.3g} ({status})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Performance benchmarks for the prediction pipeline")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("streaming", help="Chunked Elo/QB Elo training across seasons")
+    p.add_argument("--start", type=int, default=1999)
+    p.add_argument("--end", type=int, default=2025)
+    p.set_defaults(func=bench_streaming)
+
+    p = sub.add_parser("teardown", help="Vectorized error-analysis tables over backtest predictions")
+    p.add_argument("--seasons", type=int, nargs='+')
+    p.add_argument("--config", type=str, default='ensemble')
+    p.add_argument("--repeat", type=int, default=20)
+    p.set_defaults(func=bench_teardown)
+
+    p = sub.add_parser("storage", help="Multi-season schedule load time and size for JSON vs columnar formats")
+    p.add_argument("--seasons", type=int, nargs='+')
+    p.add_argument("--repeat", type=int, default=10)
+    p.set_defaults(func=bench_storage)
+
+    p = sub.add_parser("ingest", help="Concurrent multi-season schedule loading into one table")
+    p.add_argument("--seasons", type=int, nargs='+')
+    p.add_argument("--workers", type=int, default=8)
+    p.add_argument("--fixtures", type=str, help="Directory of nflverse-shaped fixture files to fetch uncached seasons from")
+    p.add_argument("--repeat", type=int, default=10)
+    p.set_defaults(func=bench_ingest)
+
+    p = sub.add_parser("transform", help="Schedule + weekly stats ingestion transform throughput over many seasons")
+    p.add_argument("--seasons", type=int, default=25)
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_transform)
+
+    p = sub.add_parser("pbp", help="Streaming play-by-play ingestion into team-week EPA tables")
+    p.add_argument("--directory", type=str, help="Directory of play_by_play_<season>.parquet files (synthetic if omitted)")
+    p.add_argument("--seasons", type=int, default=3)
+    p.add_argument("--plays", type=int, default=50000)
+    p.add_argument("--batch-sizes", type=int, nargs='+', default=[8192, 65536, 1000000])
+    p.set_defaults(func=bench_pbp)
+
+    p = sub.add_parser("features", help="Point-in-time team stats: per-week recompute vs the feature store")
+    p.add_argument("--seasons", type=int, nargs='+', default=[2023, 2024, 2025])
+    p.set_defaults(func=bench_features)
+
+    p = sub.add_parser("cv", help="Cross-validation feature build, checked against streaming training at season starts")
+    p.add_argument("--seasons", type=int, nargs='+', default=[2023, 2024, 2025])
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_cv)
+
+    p = sub.add_parser("bootstrap", help="Batched bootstrap ratings, checked against EloModel.train on unit weights")
+    p.add_argument("--season", type=int, default=2024)
+    p.add_argument("--replicates", type=int, default=1000)
+    p.set_defaults(func=bench_bootstrap)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
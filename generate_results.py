@@ -78,6 +78,7 @@ def generate_superbowl_chart():
     from src.models.qb_elo import QBEloModel
     from src.models.hfa import DynamicHFAModel
     from src.models.predictor import GamePredictor
+    from src.models.training import TrainingGraph, TrainingTask, ensemble_tasks, model_cache
     from src.utils.upsets import UpsetDetector
     from src.models.superbowl_2025 import SuperBowl2025Predictor
     
@@ -85,16 +86,13 @@ def generate_superbowl_chart():
     schedule_2025 = client.get_schedules(2025)
     completed = [g for g in schedule_2025 if g['Status'] == 'Final']
     
-    elo = EloModel(k_factor=50, hfa=40)
-    pyth = PythagoreanModel()
-    srs = SRSModel()
-    form = RecentFormModel()
-    power = PowerRatingModel()
-    qb = QBEloModel()
-    hfa = DynamicHFAModel()
-    epa = EPAModel()
+    graph = TrainingGraph(ensemble_tasks(include_sklearn=False) + [TrainingTask('hfa', DynamicHFAModel)],
+                          cache=model_cache())
+    trained = graph.run(completed)
+    graph.print_timings()
     
-    for m in [elo, pyth, srs, form, power, qb, hfa, epa]: m.train(completed)
+    elo, pyth, srs, form = trained['elo'], trained['pyth'], trained['srs'], trained['form']
+    power, qb, hfa, epa = trained['power'], trained['qb'], trained['hfa'], trained['epa']
     
     predictor = GamePredictor(elo, pyth, srs, form, power, qb, hfa, epa_model=epa, upset_detector=UpsetDetector())
     
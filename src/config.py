@@ -4,6 +4,7 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
 RAW_DATA_DIR = os.path.join(DATA_DIR, "raw")
 PROCESSED_DATA_DIR = os.path.join(DATA_DIR, "processed")
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "results")
 
 DEFAULT_SEASON = 2024
 SIMULATION_RUNS = 1000
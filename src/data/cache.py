@@ -0,0 +1,128 @@
+import os
+import json
+import pickle
+import hashlib
+import inspect
+import logging
+from typing import Any, Optional
+from src.config import PROCESSED_DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(PROCESSED_DATA_DIR, "cache")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_code_versions = {}
+
+
+def fingerprint(*parts: Any) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            h.update(part)
+        else:
+            h.update(json.dumps(part, sort_keys=True, default=str).encode())
+        h.update(b'\x00')
+    return h.hexdigest()
+
+
+def source_version(root: str = SOURCE_ROOT) -> str:
+    if root not in _code_versions:
+        h = hashlib.sha256()
+        for directory, dirs, files in os.walk(root):
+            dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+            for name in sorted(f for f in files if f.endswith('.py')):
+                path = os.path.join(directory, name)
+                h.update(os.path.relpath(path, root).encode())
+                with open(path, 'rb') as f:
+                    h.update(hashlib.sha256(f.read()).digest())
+        _code_versions[root] = h.hexdigest()[:16]
+    return _code_versions[root]
+
+
+def code_version(obj: Any) -> str:
+    path = inspect.getsourcefile(obj)
+    if path not in _code_versions:
+        with open(path, 'rb') as f:
+            _code_versions[path] = hashlib.sha256(f.read()).hexdigest()[:16]
+    return fingerprint(_code_versions[path], source_version())[:16]
+
+
+class DiskCache:
+    def __init__(self, namespace: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = os.path.join(CACHE_DIR, namespace)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        os.utime(path)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> bool:
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to cache {key}: {e}")
+            self._remove(tmp_path)
+            return False
+
+        self.evict()
+        return True
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.pkl'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            logger.debug(f"Evicted {path}")
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            self._remove(os.path.join(self.directory, name))
+
+    def size_bytes(self) -> int:
+        return sum(os.path.getsize(os.path.join(self.directory, n)) for n in os.listdir(self.directory))
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
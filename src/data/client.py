@@ -1,14 +1,93 @@
-import nfl_data_py as nfl
+import numpy as np
 import pandas as pd
 import logging
-from typing import List, Dict, Optional, Any
-from src.data import storage
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Iterable, Iterator, Tuple
+from src.data import storage, shared
+from src.data.players import PlayerWeeks, save_player_weeks, player_weeks_file
 
 logger = logging.getLogger(__name__)
 
+STAT_FIELDS = {
+    'rushing_yards': 'rush_yards',
+    'passing_yards': 'pass_yards',
+    'turnovers': 'turnovers',
+    'rushing_epa': 'rush_epa',
+    'passing_epa': 'pass_epa',
+}
+GRANULAR_COLUMNS = [f"{side}_{stat}" for side in ('home', 'away') for stat in STAT_FIELDS.values()]
+SCHEDULE_TABLE = "schedules_{}.arrow"
+# 2: spread_line negated at ingest so home favorites are negative
+SCHEDULE_FORMAT = 2
+SCHEDULE_COLUMNS = ['Season', 'Week', 'HomeTeam', 'AwayTeam', 'HomeScore', 'AwayScore', 'GameKey', 'Status', 'Date',
+                    'HomeRest', 'AwayRest', 'spread_line', 'home_qb_name', 'away_qb_name'] + GRANULAR_COLUMNS
+
+
+def attach_team_stats(df: pd.DataFrame, p_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    n = len(df)
+    teams = np.concatenate([df['home_team'].to_numpy(), df['away_team'].to_numpy(), p_df['recent_team'].to_numpy()])
+    season = np.concatenate([df['season'].to_numpy(), df['season'].to_numpy(), p_df['season'].to_numpy()]).astype(np.int64)
+    week = np.concatenate([df['week'].to_numpy(), df['week'].to_numpy(), p_df['week'].to_numpy()]).astype(np.int64)
+
+    team_codes, team_names = pd.factorize(teams)
+    season = season - season.min() if len(season) else season
+    key = (season * (week.max(initial=0) + 1) + week) * max(len(team_names), 1) + team_codes
+    game_keys, player_keys = key[:2 * n], key[2 * n:]
+    size = int(key.max(initial=0)) + 1
+
+    turnovers = (p_df['interceptions'].to_numpy(dtype=float) + p_df['rushing_fumbles_lost'].to_numpy(dtype=float)
+                 + p_df['receiving_fumbles_lost'].to_numpy(dtype=float) + p_df['sack_fumbles_lost'].to_numpy(dtype=float))
+    out = {}
+    for field, stat in STAT_FIELDS.items():
+        values = turnovers if field == 'turnovers' else p_df[field].to_numpy(dtype=float)
+        totals = np.bincount(player_keys, weights=np.nan_to_num(values), minlength=size)[game_keys]
+        out[f"home_{stat}"] = totals[:n]
+        out[f"away_{stat}"] = totals[n:]
+    return out
+
+
+def rest_days(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    n = len(df)
+    if 'gameday' not in df.columns:
+        return np.full(n, 7), np.full(n, 7)
+
+    dates = pd.to_datetime(df['gameday']).to_numpy()
+    teams = np.concatenate([df['home_team'].to_numpy(), df['away_team'].to_numpy()])
+    played = pd.Series(np.concatenate([dates, dates]))
+    order = np.lexsort((played.to_numpy(), teams))
+    gaps = played.iloc[order].groupby(teams[order]).diff().dt.days.fillna(7).astype(int).to_numpy()
+
+    rest = np.empty(2 * n, dtype=int)
+    rest[order] = gaps
+    return rest[:n], rest[n:]
+
+
+def changed_game_keys(cached: List[Dict], fresh: pd.DataFrame) -> List[str]:
+    known = {g['GameKey']: (g.get('Status'), g.get('HomeScore'), g.get('AwayScore')) for g in cached}
+    status = np.where(fresh['result'].notna(), 'Final', 'Scheduled')
+    home_score = fresh['home_score'].fillna(0).to_numpy(dtype=float)
+    away_score = fresh['away_score'].fillna(0).to_numpy(dtype=float)
+    return [key for key, s, h, a in zip(fresh['game_id'].tolist(), status.tolist(), home_score.tolist(), away_score.tolist())
+            if known.get(key) != (s, h, a)]
+
+
+def upsert_games(cached: List[Dict], fresh: List[Dict]) -> List[Dict]:
+    updates = {g['GameKey']: g for g in fresh}
+    merged = [updates.pop(g['GameKey'], g) for g in cached]
+    return merged + list(updates.values())
+
+
 class NFLVerseClient:
-    def __init__(self):
-        pass
+    def __init__(self, source=None):
+        self._source = source
+
+    @property
+    def source(self):
+        if self._source is None:
+            import nfl_data_py
+            self._source = nfl_data_py
+        return self._source
 
     def get_teams(self, force_refresh: bool = False) -> List[Dict]:
         filename = "teams_nflverse.json"
@@ -20,7 +99,7 @@ class NFLVerseClient:
 
         try:
             logger.info("Fetching Team Data from NFLVerse...")
-            df = nfl.import_team_desc()
+            df = self.source.import_team_desc()
             df = df.fillna('')
             
             df_renamed = df.rename(columns={
@@ -38,112 +117,180 @@ class NFLVerseClient:
             logger.error(f"Error fetching teams: {e}")
             return []
 
+    def _schedule_frame(self, season: int) -> pd.DataFrame:
+        df = self.source.import_schedules([season])
+        
+        if 'game_type' in df.columns:
+            df = df[df['game_type'] == 'REG']
+        return df
+
+    def _weekly_frame(self, season: int, weeks: Optional[List[int]] = None) -> pd.DataFrame:
+        logger.info("Fetching Weekly Player Stats for Granular Metrics...")
+        p_df = self.source.import_weekly_data([season])
+        if weeks is not None:
+            p_df = p_df[p_df['week'].isin(weeks)]
+        return p_df
+
+    def _store_weekly(self, season: int, weeks: Optional[List[int]] = None) -> Optional[pd.DataFrame]:
+        try:
+            p_df = self._weekly_frame(season, weeks)
+            save_player_weeks(p_df, season, weeks)
+            return p_df
+        except Exception as e:
+            logger.error(f"Failed to store weekly player stats: {e}")
+            return None
+
+    def _schedule_table(self, df: pd.DataFrame, season: int, weeks: Optional[List[int]] = None,
+                        p_df: Optional[pd.DataFrame] = None, season_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        try:
+            if p_df is None:
+                p_df = self._weekly_frame(season, weeks)
+            stats = attach_team_stats(df, p_df)
+        except Exception as e:
+            logger.error(f"Failed to merge granular stats: {e}")
+            stats = {c: np.zeros(len(df)) for c in GRANULAR_COLUMNS}
+
+        if 'home_rest' in df.columns and 'away_rest' in df.columns:
+            home_rest, away_rest = df['home_rest'].to_numpy(), df['away_rest'].to_numpy()
+        elif season_df is not None:
+            home_rest, away_rest = rest_days(season_df)
+            rows = pd.Index(season_df['game_id']).get_indexer(df['game_id'])
+            home_rest, away_rest = home_rest[rows], away_rest[rows]
+        else:
+            home_rest, away_rest = rest_days(df)
+
+        table = pd.DataFrame({
+            'Season': df['season'].to_numpy(),
+            'Week': df['week'].to_numpy(),
+            'HomeTeam': df['home_team'].to_numpy(),
+            'AwayTeam': df['away_team'].to_numpy(),
+            'HomeScore': df['home_score'].fillna(0).to_numpy(),
+            'AwayScore': df['away_score'].fillna(0).to_numpy(),
+            'GameKey': df['game_id'].to_numpy(),
+            'Status': np.where(df['result'].notna(), 'Final', 'Scheduled'),
+            'Date': df['gameday'].to_numpy(),
+            'HomeRest': home_rest,
+            'AwayRest': away_rest,
+            'spread_line': -df['spread_line'].to_numpy() if 'spread_line' in df.columns else 0.0,
+            'home_qb_name': df['home_qb_name'].to_numpy(),
+            'away_qb_name': df['away_qb_name'].to_numpy(),
+            **{c: stats[c] for c in GRANULAR_COLUMNS},
+        })
+        return table
+
     def get_schedules(self, season: int, force_refresh: bool = False) -> List[Dict]:
         filename = f"schedules_nflverse_{season}.json"
         
         if not force_refresh:
-            data = storage.load_json(filename, processed=False)
+            data = storage.load_json(filename, processed=False, version=SCHEDULE_FORMAT)
             if data:
                 return data
 
         try:
             logger.info(f"Fetching Schedule for {season} from NFLVerse...")
-            df = nfl.import_schedules([season])
-            
-            if 'game_type' in df.columns:
-                df = df[df['game_type'] == 'REG']
+            df = self._schedule_frame(season)
+            table = self._schedule_table(df, season, p_df=self._store_weekly(season))
+            storage.save_table(SCHEDULE_TABLE.format(season), table)
             
-            try:
-                logger.info("Fetching Weekly Player Stats for Granular Metrics...")
-                p_df = nfl.import_weekly_data([season])
-                
-                p_df['turnovers'] = p_df['interceptions'] + p_df['rushing_fumbles_lost'] + p_df['receiving_fumbles_lost'] + p_df['sack_fumbles_lost']
-                
-                team_stats = p_df.groupby(['season', 'week', 'recent_team'])[['rushing_yards', 'passing_yards', 'turnovers', 'rushing_epa', 'passing_epa']].sum().reset_index()
-                
-                df = df.merge(team_stats, left_on=['season', 'week', 'home_team'], right_on=['season', 'week', 'recent_team'], how='left')
-                df = df.rename(columns={
-                    'rushing_yards': 'home_rush_yards', 
-                    'passing_yards': 'home_pass_yards',
-                    'turnovers': 'home_turnovers',
-                    'rushing_epa': 'home_rush_epa',
-                    'passing_epa': 'home_pass_epa'
-                })
-                if 'recent_team' in df.columns: df = df.drop(columns=['recent_team'])
-                
-                df = df.merge(team_stats, left_on=['season', 'week', 'away_team'], right_on=['season', 'week', 'recent_team'], how='left', suffixes=('', '_away'))
-                
-                df = df.rename(columns={
-                    'rushing_yards': 'away_rush_yards', 
-                    'passing_yards': 'away_pass_yards',
-                    'turnovers': 'away_turnovers',
-                    'rushing_epa': 'away_rush_epa',
-                    'passing_epa': 'away_pass_epa'
-                })
-                if 'recent_team' in df.columns: df = df.drop(columns=['recent_team'])
-                
-                df = df.fillna({
-                    'home_rush_yards': 0, 'home_pass_yards': 0, 'home_turnovers': 0, 'home_rush_epa': 0, 'home_pass_epa': 0,
-                    'away_rush_yards': 0, 'away_pass_yards': 0, 'away_turnovers': 0, 'away_rush_epa': 0, 'away_pass_epa': 0
-                })
-                
-            except Exception as e:
-                logger.error(f"Failed to merge granular stats: {e}")
-                cols = ['home_rush_yards', 'home_pass_yards', 'home_turnovers', 'home_rush_epa', 'home_pass_epa',
-                        'away_rush_yards', 'away_pass_yards', 'away_turnovers', 'away_rush_epa', 'away_pass_epa']
-                for c in cols:
-                    df[c] = 0.0
-
-            df['home_score'] = df['home_score'].fillna(0)
-            df['away_score'] = df['away_score'].fillna(0)
-            
-            def get_status(row):
-                if pd.notnull(row['result']):
-                    return 'Final'
-                return 'Scheduled'
-            
-            df['Status'] = df.apply(get_status, axis=1)
-            
-            if 'home_rest' not in df.columns: df['home_rest'] = 7
-            if 'away_rest' not in df.columns: df['away_rest'] = 7
-            
-            if 'spread_line' in df.columns:
-                 df['spread_line'] = -df['spread_line']
-            else:
-                 df['spread_line'] = 0.0
-
-            df_renamed = df.rename(columns={
-                'season': 'Season',
-                'week': 'Week',
-                'home_team': 'HomeTeam',
-                'away_team': 'AwayTeam',
-                'home_score': 'HomeScore',
-                'away_score': 'AwayScore',
-                'game_id': 'GameKey',
-                'gameday': 'Date',
-                'home_rest': 'HomeRest',
-                'away_rest': 'AwayRest',
-                'spread_line': 'spread_line',
-                'home_rush_yards': 'home_rush_yards',
-                'home_pass_yards': 'home_pass_yards',
-                'home_turnovers': 'home_turnovers',
-                'home_rush_epa': 'home_rush_epa',
-                'home_pass_epa': 'home_pass_epa',
-                'away_rush_yards': 'away_rush_yards',
-                'away_pass_yards': 'away_pass_yards',
-                'away_turnovers': 'away_turnovers',
-                'away_rush_epa': 'away_rush_epa',
-                'away_pass_epa': 'away_pass_epa'
-            })
-            
-            cols = ['Season', 'Week', 'HomeTeam', 'AwayTeam', 'HomeScore', 'AwayScore', 'GameKey', 'Status', 'Date', 'HomeRest', 'AwayRest', 'spread_line', 'home_qb_name', 'away_qb_name',
-                    'home_rush_yards', 'home_pass_yards', 'home_turnovers', 'home_rush_epa', 'home_pass_epa', 
-                    'away_rush_yards', 'away_pass_yards', 'away_turnovers', 'away_rush_epa', 'away_pass_epa']
-            data = df_renamed[cols].to_dict(orient='records')
-            
-            storage.save_json(filename, data, processed=False)
+            data = table.to_dict(orient='records')
+            storage.save_json(filename, data, processed=False, version=SCHEDULE_FORMAT)
             return data
             
         except Exception as e:
             logger.error(f"Error fetching schedule: {e}")
             return []
+
+    def refresh_schedules(self, season: int) -> Tuple[List[Dict], List[str]]:
+        filename = f"schedules_nflverse_{season}.json"
+        cached = storage.load_json(filename, processed=False, version=SCHEDULE_FORMAT)
+        if not cached:
+            data = self.get_schedules(season, force_refresh=True)
+            return data, [g['GameKey'] for g in data]
+
+        try:
+            logger.info(f"Checking Schedule for {season} against NFLVerse...")
+            df = self._schedule_frame(season)
+            changed = changed_game_keys(cached, df)
+            if not changed:
+                logger.info(f"Schedule for {season} is up to date")
+                return cached, []
+
+            updates = df[df['game_id'].isin(changed)]
+            weeks = sorted(int(w) for w in updates['week'].unique())
+            logger.info(f"Refreshing {len(changed)} game(s) in week(s) {weeks}")
+            fresh = self._schedule_table(updates, season, weeks, p_df=self._store_weekly(season, weeks),
+                                         season_df=df).to_dict(orient='records')
+            data = upsert_games(cached, fresh)
+
+            storage.save_json(filename, data, processed=False, version=SCHEDULE_FORMAT)
+            storage.save_table(SCHEDULE_TABLE.format(season), data)
+            return data, changed
+
+        except Exception as e:
+            logger.error(f"Error refreshing schedule: {e}")
+            return cached, []
+
+    def iter_schedules(self, seasons: Iterable[int], force_refresh: bool = False) -> Iterator[Tuple[int, List[Dict]]]:
+        for season in sorted(seasons):
+            data = self.get_schedules(season, force_refresh=force_refresh)
+            if not data:
+                logger.warning(f"No schedule available for {season}, skipping")
+                continue
+            yield season, data
+
+    def _table_stale(self, season: int) -> bool:
+        source = f"schedules_nflverse_{season}.json"
+        return storage.is_stale(SCHEDULE_TABLE.format(season), source) or storage.json_version(source) != SCHEDULE_FORMAT
+
+    def _season_table(self, season: int, force_refresh: bool = False,
+                      columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        filename = SCHEDULE_TABLE.format(season)
+
+        if not force_refresh and not self._table_stale(season):
+            df = storage.load_table(filename, columns=columns)
+            if df is not None:
+                return df
+
+        data = self.get_schedules(season, force_refresh=force_refresh)
+        if not data:
+            logger.warning(f"No schedule available for {season}, skipping")
+            return None
+        df = storage.records_to_frame(data)
+        storage.save_table(filename, df)
+        if columns is not None:
+            df = df[[c for c in columns if c in df.columns]]
+        return df
+
+    def schedule_columns(self, season: int, force_refresh: bool = False) -> Optional[Dict[str, np.ndarray]]:
+        filename = SCHEDULE_TABLE.format(season)
+        if force_refresh or self._table_stale(season):
+            if self._season_table(season, force_refresh) is None:
+                return None
+        table = storage.load_arrow(filename)
+        return shared.arrow_columns(table) if table is not None else None
+
+    def get_schedules_many(self, seasons: Iterable[int], force_refresh: bool = False,
+                           columns: Optional[List[str]] = None, max_workers: Optional[int] = None) -> pd.DataFrame:
+        start = time.perf_counter()
+        seasons = sorted(set(seasons))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            frames = list(pool.map(lambda s: self._season_table(s, force_refresh, columns), seasons))
+        frames = [f for f in frames if f is not None]
+
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        table = pd.concat(frames, ignore_index=True)
+        logger.info(f"Loaded {len(table)} scheduled games from {len(frames)} season(s) in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return table
+
+    def get_player_weeks(self, seasons: Iterable[int], force_refresh: bool = False,
+                         columns: Optional[List[str]] = None) -> PlayerWeeks:
+        seasons = sorted(set(seasons))
+        for season in seasons:
+            if force_refresh or not storage.file_exists(player_weeks_file(season), processed=True):
+                self._store_weekly(season)
+        return PlayerWeeks.load(seasons, columns=columns)
+
+    def get_schedule_table(self, seasons: Iterable[int], force_refresh: bool = False,
+                           columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return self.get_schedules_many(seasons, force_refresh=force_refresh, columns=columns, max_workers=1)
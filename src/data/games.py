@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+STAT_FIELDS = ('home_turnovers', 'away_turnovers', 'home_pass_epa', 'home_rush_epa', 'away_pass_epa', 'away_rush_epa')
+
+
+def _column(records: List[Dict], key: str, default=0.0) -> np.ndarray:
+    return np.array([g.get(key, default) or default for g in records], dtype=float)
+
+
+class GameTable:
+    def __init__(self, season: np.ndarray, week: np.ndarray, home: np.ndarray, away: np.ndarray,
+                 home_score: np.ndarray, away_score: np.ndarray, final: np.ndarray,
+                 home_qb: np.ndarray, away_qb: np.ndarray, stats: Dict[str, np.ndarray],
+                 teams: np.ndarray, qbs: np.ndarray, records: Optional[List[Dict]] = None):
+        self.season = season
+        self.week = week
+        self.home = home
+        self.away = away
+        self.home_score = home_score
+        self.away_score = away_score
+        self.final = final
+        self.home_qb = home_qb
+        self.away_qb = away_qb
+        self.stats = stats
+        self.teams = teams
+        self.qbs = qbs
+        self.records = records
+        self.order = np.lexsort((week, season))
+        self._qb_lookup = np.append(qbs, None)
+
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> 'GameTable':
+        records = list(records)
+        n = len(records)
+        team_codes, teams = pd.factorize(pd.Series([g['HomeTeam'] for g in records] + [g['AwayTeam'] for g in records], dtype=object))
+        qb_names = [g.get('home_qb_name') or None for g in records] + [g.get('away_qb_name') or None for g in records]
+        qb_codes, qbs = pd.factorize(pd.Series(qb_names, dtype=object))
+
+        return cls(
+            season=np.array([g['Season'] for g in records], dtype=np.int64),
+            week=np.array([g['Week'] for g in records], dtype=np.int64),
+            home=team_codes[:n].astype(np.int32),
+            away=team_codes[n:].astype(np.int32),
+            home_score=_column(records, 'HomeScore'),
+            away_score=_column(records, 'AwayScore'),
+            final=np.array([g.get('Status') == 'Final' for g in records], dtype=bool),
+            home_qb=qb_codes[:n].astype(np.int32),
+            away_qb=qb_codes[n:].astype(np.int32),
+            stats={field: _column(records, field) for field in STAT_FIELDS},
+            teams=np.asarray(teams, dtype=object),
+            qbs=np.asarray(qbs, dtype=object),
+            records=records,
+        )
+
+    @classmethod
+    def coerce(cls, games) -> 'GameTable':
+        return games if isinstance(games, GameTable) else cls.from_records(games)
+
+    @staticmethod
+    def as_records(games) -> List[Dict]:
+        return games.to_records() if isinstance(games, GameTable) else games
+
+    def __len__(self) -> int:
+        return len(self.season)
+
+    def __getitem__(self, key) -> 'GameTable':
+        if isinstance(key, slice):
+            records = self.records[key] if self.records is not None else None
+        else:
+            key = np.asarray(key)
+            if key.dtype == bool:
+                key = np.flatnonzero(key)
+            records = [self.records[i] for i in key.tolist()] if self.records is not None else None
+
+        return GameTable(
+            season=self.season[key], week=self.week[key], home=self.home[key], away=self.away[key],
+            home_score=self.home_score[key], away_score=self.away_score[key], final=self.final[key],
+            home_qb=self.home_qb[key], away_qb=self.away_qb[key],
+            stats={field: values[key] for field, values in self.stats.items()},
+            teams=self.teams, qbs=self.qbs, records=records,
+        )
+
+    def sorted(self) -> 'GameTable':
+        return self[self.order]
+
+    def final_index(self, ordered: bool = False) -> np.ndarray:
+        index = self.order if ordered else np.arange(len(self))
+        return index[self.final[index]]
+
+    def column(self, name: str, index: np.ndarray) -> list:
+        if name == 'HomeTeam':
+            return self.teams[self.home[index]].tolist()
+        if name == 'AwayTeam':
+            return self.teams[self.away[index]].tolist()
+        if name == 'home_qb_name':
+            return self._qb_lookup[self.home_qb[index]].tolist()
+        if name == 'away_qb_name':
+            return self._qb_lookup[self.away_qb[index]].tolist()
+        if name == 'HomeScore':
+            return self.home_score[index].tolist()
+        if name == 'AwayScore':
+            return self.away_score[index].tolist()
+        if name == 'Season':
+            return self.season[index].tolist()
+        if name == 'Week':
+            return self.week[index].tolist()
+        return self.stats[name][index].tolist()
+
+    def final_rows(self, *names: str, ordered: bool = False):
+        index = self.final_index(ordered)
+        return zip(*(self.column(name, index) for name in names))
+
+    def to_records(self) -> List[Dict]:
+        if self.records is not None:
+            return list(self.records)
+        index = np.arange(len(self))
+        names = ('Season', 'Week', 'HomeTeam', 'AwayTeam', 'HomeScore', 'AwayScore', 'home_qb_name', 'away_qb_name') + STAT_FIELDS
+        status = np.where(self.final, 'Final', 'Scheduled').tolist()
+        return [dict(zip(names, row), Status=s) for row, s in zip(zip(*(self.column(n, index) for n in names)), status)]
@@ -0,0 +1,126 @@
+import os
+import re
+import time
+import logging
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.data import storage
+
+logger = logging.getLogger(__name__)
+
+PBP_COLUMNS = ['season', 'week', 'season_type', 'posteam', 'defteam', 'play_type', 'down', 'epa', 'wp']
+PBP_PATTERN = re.compile(r"^play_by_play_(\d{4})\.parquet$")
+PLAY_TYPES = {'pass': 'pass', 'run': 'rush'}
+WP_BOUNDS = (0.05, 0.95)
+
+TEAM_WEEK_COLUMNS = ['Season', 'Week', 'Team',
+                     'off_pass_epa', 'off_rush_epa', 'def_pass_epa', 'def_rush_epa',
+                     'off_pass_plays', 'off_rush_plays', 'def_pass_plays', 'def_rush_plays',
+                     'off_early_down_epa', 'off_late_down_epa']
+
+
+def pbp_files(directory: str) -> Dict[int, str]:
+    matches = ((PBP_PATTERN.match(name), name) for name in os.listdir(directory))
+    return {int(m.group(1)): os.path.join(directory, name) for m, name in matches if m}
+
+
+def iter_pbp_batches(path: str, batch_size: int = 65536) -> Iterator[pd.DataFrame]:
+    pf = pq.ParquetFile(path)
+    columns = [c for c in PBP_COLUMNS if c in pf.schema_arrow.names]
+    for batch in pf.iter_batches(batch_size=batch_size, columns=columns):
+        yield batch.to_pandas()
+
+
+def _batch_sums(plays: pd.DataFrame, wp_bounds: Tuple[float, float] = WP_BOUNDS) -> pd.DataFrame:
+    if 'season_type' in plays.columns:
+        plays = plays[plays['season_type'] == 'REG']
+    kind = plays['play_type'].map(PLAY_TYPES)
+    keep = kind.notna() & plays['epa'].notna() & plays['posteam'].notna() & plays['defteam'].notna()
+    if 'wp' in plays.columns:
+        keep &= plays['wp'].between(*wp_bounds) | plays['wp'].isna()
+    plays = plays[keep]
+    kind = kind[keep]
+
+    epa = plays['epa'].to_numpy(dtype=float)
+    is_pass = (kind == 'pass').to_numpy()
+    early = (plays['down'].to_numpy(dtype=float) <= 2) if 'down' in plays.columns else np.ones(len(plays), dtype=bool)
+    frame = pd.DataFrame({
+        'Season': plays['season'].to_numpy(),
+        'Week': plays['week'].to_numpy(),
+        'pass_epa': np.where(is_pass, epa, 0.0),
+        'rush_epa': np.where(is_pass, 0.0, epa),
+        'pass_plays': is_pass.astype(np.int64),
+        'rush_plays': (~is_pass).astype(np.int64),
+        'early_epa': np.where(early, epa, 0.0),
+        'early_plays': early.astype(np.int64),
+        'late_epa': np.where(early, 0.0, epa),
+        'late_plays': (~early).astype(np.int64),
+    })
+
+    offense = frame.assign(Team=plays['posteam'].to_numpy()).groupby(['Season', 'Week', 'Team']).sum()
+    defense = frame.assign(Team=plays['defteam'].to_numpy()).groupby(['Season', 'Week', 'Team'])[
+        ['pass_epa', 'rush_epa', 'pass_plays', 'rush_plays']].sum()
+    return offense.add_prefix('off_').join(defense.add_prefix('def_'), how='outer').fillna(0)
+
+
+def _accumulate(batches: Iterable[pd.DataFrame], wp_bounds: Tuple[float, float]) -> Tuple[Optional[pd.DataFrame], int]:
+    totals = None
+    plays = 0
+    for batch in batches:
+        plays += len(batch)
+        sums = _batch_sums(batch, wp_bounds)
+        totals = sums if totals is None else totals.add(sums, fill_value=0)
+    return totals, plays
+
+
+def _team_week_table(totals: Optional[pd.DataFrame]) -> pd.DataFrame:
+    if totals is None or totals.empty:
+        return pd.DataFrame(columns=TEAM_WEEK_COLUMNS)
+
+    totals = totals.sort_index().reset_index()
+    per_play = lambda epa, plays: (totals[epa] / totals[plays].where(totals[plays] > 0)).fillna(0.0)
+    out = totals[['Season', 'Week', 'Team']].copy()
+    out['off_pass_epa'] = per_play('off_pass_epa', 'off_pass_plays')
+    out['off_rush_epa'] = per_play('off_rush_epa', 'off_rush_plays')
+    out['def_pass_epa'] = per_play('def_pass_epa', 'def_pass_plays')
+    out['def_rush_epa'] = per_play('def_rush_epa', 'def_rush_plays')
+    for col in ('off_pass_plays', 'off_rush_plays', 'def_pass_plays', 'def_rush_plays'):
+        out[col] = totals[col].astype(np.int64)
+    out['off_early_down_epa'] = per_play('off_early_epa', 'off_early_plays')
+    out['off_late_down_epa'] = per_play('off_late_epa', 'off_late_plays')
+    return out[TEAM_WEEK_COLUMNS]
+
+
+def team_week_epa(batches: Iterable[pd.DataFrame], wp_bounds: Tuple[float, float] = WP_BOUNDS) -> pd.DataFrame:
+    return _team_week_table(_accumulate(batches, wp_bounds)[0])
+
+
+def ingest_pbp(directory: str, seasons: Optional[Iterable[int]] = None, batch_size: int = 65536,
+               wp_bounds: Tuple[float, float] = WP_BOUNDS) -> List[Dict]:
+    files = pbp_files(directory)
+    seasons = sorted(files) if seasons is None else sorted(set(seasons))
+    wanted = [s for s in seasons if s in files]
+    missing = [s for s in seasons if s not in files]
+    if missing:
+        logger.warning(f"No play-by-play file for season(s) {missing} in {directory}")
+
+    summary = []
+    for season in wanted:
+        start = time.perf_counter()
+        totals, plays = _accumulate(iter_pbp_batches(files[season], batch_size), wp_bounds)
+        table = _team_week_table(totals)
+        storage.save_table(f"team_week_epa_{season}.parquet", table)
+        summary.append({'Season': season, 'plays': plays, 'team_weeks': len(table),
+                         'seconds': time.perf_counter() - start})
+        logger.info(f"Ingested {plays:,} plays for {season} into {len(table)} team-weeks")
+    return summary
+
+
+def load_team_week_epa(seasons: Iterable[int]) -> pd.DataFrame:
+    frames = [storage.load_table(f"team_week_epa_{season}.parquet") for season in sorted(seasons)]
+    frames = [f for f in frames if f is not None]
+    if not frames:
+        return pd.DataFrame(columns=TEAM_WEEK_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
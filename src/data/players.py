@@ -0,0 +1,125 @@
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.data import storage
+
+logger = logging.getLogger(__name__)
+
+ID_COLUMNS = ['player_id', 'player_name', 'player_display_name', 'position', 'recent_team', 'opponent_team', 'season', 'week']
+STAT_COLUMNS = ['completions', 'attempts', 'passing_yards', 'passing_tds', 'interceptions', 'sacks', 'sack_fumbles_lost',
+                'passing_epa', 'carries', 'rushing_yards', 'rushing_tds', 'rushing_fumbles_lost', 'rushing_epa',
+                'receptions', 'targets', 'receiving_yards', 'receiving_tds', 'receiving_fumbles_lost', 'receiving_epa',
+                'fantasy_points_ppr']
+SORT_COLUMNS = ['season', 'week', 'recent_team', 'player_id']
+
+
+def player_weeks_file(season: int) -> str:
+    return f"weekly_players_{season}.parquet"
+
+
+def compact_weekly(p_df: pd.DataFrame) -> pd.DataFrame:
+    df = p_df.reindex(columns=ID_COLUMNS + [c for c in STAT_COLUMNS if c in p_df.columns])
+    df['season'] = df['season'].astype(np.int16)
+    df['week'] = df['week'].astype(np.int8)
+    for col in df.columns:
+        if col in STAT_COLUMNS:
+            df[col] = df[col].astype(np.float32)
+        elif col not in ('season', 'week'):
+            df[col] = df[col].astype(str).where(df[col].notna())
+    return df.sort_values(SORT_COLUMNS, kind='stable').reset_index(drop=True)
+
+
+def save_player_weeks(p_df: pd.DataFrame, season: int, weeks: Optional[Iterable[int]] = None) -> pd.DataFrame:
+    df = compact_weekly(p_df)
+    if weeks is not None:
+        existing = storage.load_table(player_weeks_file(season))
+        if existing is not None:
+            kept = existing[~existing['week'].isin(list(weeks))]
+            df = compact_weekly(pd.concat([kept, df], ignore_index=True))
+    storage.save_table(player_weeks_file(season), df)
+    logger.info(f"Saved {len(df):,} player-weeks for {season}")
+    return df
+
+
+def load_player_weeks(seasons: Iterable[int], columns: Optional[List[str]] = None) -> Tuple[pd.DataFrame, List[int]]:
+    frames, missing = [], []
+    for season in sorted(set(seasons)):
+        df = storage.load_table(player_weeks_file(season), columns=columns)
+        if df is None:
+            missing.append(season)
+        else:
+            frames.append(df)
+    frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns or ID_COLUMNS)
+    return frame, missing
+
+
+class PlayerWeeks:
+    def __init__(self, frame: pd.DataFrame):
+        frame = frame.sort_values(SORT_COLUMNS, kind='stable').reset_index(drop=True)
+        self.frame = frame
+
+        season = frame['season'].to_numpy(dtype=np.int64)
+        week = frame['week'].to_numpy(dtype=np.int64)
+        team_codes, team_names = pd.factorize(frame['recent_team'])
+        change = np.ones(len(frame), dtype=bool)
+        change[1:] = (season[1:] != season[:-1]) | (week[1:] != week[:-1]) | (team_codes[1:] != team_codes[:-1])
+        starts = np.flatnonzero(change)
+        stops = np.append(starts[1:], len(frame))
+        teams = np.append(np.asarray(team_names, dtype=object), None)[team_codes[starts]]
+        self._team_weeks: Dict[Tuple[int, int, str], Tuple[int, int]] = {
+            (s, w, t): (a, b) for s, w, t, a, b in zip(season[starts].tolist(), week[starts].tolist(), teams.tolist(),
+                                                      starts.tolist(), stops.tolist())
+        }
+
+        codes, ids = pd.factorize(frame['player_id'])
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(ids) + 1))
+        self._players: Dict[str, np.ndarray] = {pid: order[a:b] for pid, a, b in
+                                                zip(ids.tolist(), bounds[:-1].tolist(), bounds[1:].tolist())}
+
+        self._names: Dict[str, str] = {}
+        for col in ('player_name', 'player_display_name'):
+            if col in frame.columns:
+                named = frame[['player_id', col]].dropna().drop_duplicates(col, keep='last')
+                self._names.update(zip(named[col].tolist(), named['player_id'].tolist()))
+
+    @classmethod
+    def load(cls, seasons: Iterable[int], columns: Optional[List[str]] = None) -> 'PlayerWeeks':
+        if columns is not None:
+            columns = list(dict.fromkeys(ID_COLUMNS + columns))
+        frame, missing = load_player_weeks(seasons, columns)
+        if missing:
+            logger.warning(f"No stored player-weeks for season(s) {missing}")
+        return cls(frame)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def _columns(self, df: pd.DataFrame, columns: Optional[List[str]]) -> pd.DataFrame:
+        return df if columns is None else df[columns]
+
+    def team_week(self, season: int, week: int, team: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        start, stop = self._team_weeks.get((season, week, team), (0, 0))
+        return self._columns(self.frame.iloc[start:stop], columns)
+
+    def player_id(self, player: str) -> Optional[str]:
+        return player if player in self._players else self._names.get(player)
+
+    def player(self, player: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        rows = self._players.get(self.player_id(player), np.empty(0, dtype=np.int64))
+        return self._columns(self.frame.take(rows), columns)
+
+    def passers(self, season: int, week: int, team: str) -> pd.DataFrame:
+        rows = self.team_week(season, week, team)
+        if 'attempts' not in rows.columns:
+            return rows.iloc[0:0]
+        return rows[rows['attempts'] > 0].sort_values('attempts', ascending=False)
+
+    def qb_epa(self, player: Optional[str]) -> pd.Series:
+        if not player:
+            return pd.Series(dtype=float)
+        rows = self.player(player)
+        per_week = rows['passing_epa'].fillna(0) + rows['rushing_epa'].fillna(0)
+        return pd.Series(per_week.to_numpy(dtype=float), index=pd.MultiIndex.from_arrays(
+            [rows['season'].to_numpy(), rows['week'].to_numpy()], names=['season', 'week']))
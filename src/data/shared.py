@@ -0,0 +1,186 @@
+import os
+import uuid
+import atexit
+import shutil
+import logging
+import weakref
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+from src.config import PROCESSED_DATA_DIR
+from src.data import storage
+
+logger = logging.getLogger(__name__)
+
+SHARED_DIR = os.path.join(PROCESSED_DATA_DIR, "shared")
+NULL_PREFIX = "__null__"
+
+_live_tables = weakref.WeakSet()
+_attached: Dict[str, List] = {}
+
+
+def _fixed_width(values: np.ndarray) -> np.ndarray:
+    if values.dtype != object:
+        return values
+    return np.array(['' if v is None else str(v) for v in values], dtype=str)
+
+
+def table_columns(data) -> Dict[str, np.ndarray]:
+    df = storage.records_to_frame(data)
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+            columns[col] = values.to_numpy()
+        else:
+            columns[col] = values.fillna('').astype(str).to_numpy(dtype=str)
+            columns[NULL_PREFIX + col] = values.isna().to_numpy()
+    return columns
+
+
+def arrow_columns(table) -> Dict[str, np.ndarray]:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    columns = {}
+    for col, values in zip(table.column_names, table.columns):
+        values = values.combine_chunks()
+        if pa.types.is_dictionary(values.type):
+            labels = values.dictionary.to_numpy(zero_copy_only=False).astype(str)
+            codes = values.indices
+            if values.null_count:
+                codes = pc.fill_null(codes, len(labels))
+                labels = np.append(labels, '')
+            columns[col] = labels[codes.to_numpy()]
+            columns[NULL_PREFIX + col] = values.is_null().to_numpy(zero_copy_only=False)
+        elif pa.types.is_string(values.type) or pa.types.is_large_string(values.type) or pa.types.is_null(values.type):
+            columns[col] = pc.fill_null(values.cast(pa.string()), '').to_numpy(zero_copy_only=False).astype(str)
+            columns[NULL_PREFIX + col] = values.is_null().to_numpy(zero_copy_only=False)
+        else:
+            columns[col] = values.to_numpy(zero_copy_only=False)
+    return columns
+
+
+def table_records(columns: Dict[str, np.ndarray]) -> List[Dict]:
+    data = {}
+    for col, values in columns.items():
+        if col.startswith(NULL_PREFIX):
+            continue
+        mask = columns.get(NULL_PREFIX + col)
+        if mask is not None:
+            values = np.array(values.tolist(), dtype=object)
+            values[mask] = None
+        data[col] = values
+    return storage.frame_to_records(pd.DataFrame(data))
+
+
+def rating_columns(ratings: Dict[str, float]) -> Dict[str, np.ndarray]:
+    return {
+        'Team': np.array(list(ratings), dtype=str),
+        'Rating': np.fromiter(ratings.values(), dtype=float, count=len(ratings)),
+    }
+
+
+class SharedTables:
+    def __init__(self, backend: str = 'shm', directory: str = SHARED_DIR):
+        if backend not in ('shm', 'memmap'):
+            raise ValueError(f"Unknown shared table backend: {backend}")
+        self.backend = backend
+        self.directory = directory
+        self.token = f"nfl_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        self.handles: Dict[str, Dict] = {}
+        self._segments: List[shared_memory.SharedMemory] = []
+        self._paths: List[str] = []
+        self.owner = os.getpid()
+        _live_tables.add(self)
+
+    def publish(self, name: str, columns: Dict[str, np.ndarray]) -> Dict:
+        if name in self.handles:
+            raise ValueError(f"Table {name} is already published")
+
+        spec = {}
+        for i, (col, values) in enumerate(columns.items()):
+            values = np.ascontiguousarray(_fixed_width(np.asarray(values)))
+            if self.backend == 'shm':
+                segment = shared_memory.SharedMemory(name=f"{self.token}_{len(self.handles)}_{i}", create=True,
+                                                     size=max(values.nbytes, 1))
+                self._segments.append(segment)
+                np.ndarray(values.shape, dtype=values.dtype, buffer=segment.buf)[...] = values
+                location = segment.name
+            else:
+                table_dir = os.path.join(self.directory, self.token, name)
+                os.makedirs(table_dir, exist_ok=True)
+                location = os.path.join(table_dir, f"{i}.npy")
+                np.save(location, values)
+                self._paths.append(os.path.join(self.directory, self.token))
+            spec[col] = (location, values.dtype.str, values.shape)
+
+        handle = {'name': name, 'backend': self.backend, 'columns': spec}
+        self.handles[name] = handle
+        logger.debug(f"Published {name} ({len(spec)} columns) via {self.backend}")
+        return handle
+
+    def publish_records(self, name: str, records) -> Dict:
+        return self.publish(name, table_columns(records))
+
+    def close(self):
+        if os.getpid() != self.owner:
+            return
+        for segment in self._segments:
+            try:
+                segment.close()
+                segment.unlink()
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Failed to release shared segment {segment.name}: {e}")
+        for path in set(self._paths):
+            shutil.rmtree(path, ignore_errors=True)
+        self._segments = []
+        self._paths = []
+        self.handles = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+
+def attach(handle: Dict) -> Dict[str, np.ndarray]:
+    columns = {}
+    segments = []
+    for col, (location, dtype, shape) in handle['columns'].items():
+        if handle['backend'] == 'shm':
+            segment = shared_memory.SharedMemory(name=location)
+            segments.append(segment)
+            values = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+        else:
+            values = np.load(location, mmap_mode='r')
+        values.flags.writeable = False
+        columns[col] = values
+    _attached.setdefault(handle['name'], []).extend(segments)
+    return columns
+
+
+def detach(name: Optional[str] = None):
+    names = [name] if name is not None else list(_attached)
+    for n in names:
+        for segment in _attached.pop(n, []):
+            try:
+                segment.close()
+            except BufferError:
+                logger.debug(f"Shared segment {segment.name} still has live views")
+
+
+def release_all():
+    detach()
+    for tables in list(_live_tables):
+        tables.close()
+
+
+atexit.register(release_all)
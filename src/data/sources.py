@@ -0,0 +1,68 @@
+import os
+import logging
+import pandas as pd
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_FORMATS = ('.parquet', '.csv', '.json')
+
+
+class FixtureSource:
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, stem: str) -> str:
+        for ext in FIXTURE_FORMATS:
+            path = os.path.join(self.directory, stem + ext)
+            if os.path.exists(path):
+                return path
+        raise FileNotFoundError(f"No fixture named {stem} in {self.directory}")
+
+    def _read(self, stem: str) -> pd.DataFrame:
+        path = self._path(stem)
+        ext = os.path.splitext(path)[1]
+        if ext == '.parquet':
+            return pd.read_parquet(path)
+        if ext == '.csv':
+            return pd.read_csv(path)
+        return pd.read_json(path, orient='records')
+
+    def _seasons(self, prefix: str, years: Iterable[int]) -> pd.DataFrame:
+        frames = [self._read(f"{prefix}_{year}") for year in years]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def import_schedules(self, years: List[int]) -> pd.DataFrame:
+        return self._seasons('schedules', years)
+
+    def import_weekly_data(self, years: List[int]) -> pd.DataFrame:
+        return self._seasons('weekly', years)
+
+    def import_team_desc(self) -> pd.DataFrame:
+        return self._read('teams')
+
+
+class FrameSource:
+    def __init__(self, schedules: Dict[int, pd.DataFrame], weekly: Dict[int, pd.DataFrame],
+                 teams: Optional[pd.DataFrame] = None):
+        self.schedules = schedules
+        self.weekly = weekly
+        self.teams = teams
+
+    def import_schedules(self, years: List[int]) -> pd.DataFrame:
+        return pd.concat([self.schedules[y] for y in years], ignore_index=True)
+
+    def import_weekly_data(self, years: List[int]) -> pd.DataFrame:
+        return pd.concat([self.weekly[y] for y in years], ignore_index=True)
+
+    def import_team_desc(self) -> pd.DataFrame:
+        return self.teams if self.teams is not None else pd.DataFrame()
+
+
+def record_fixtures(source, seasons: Iterable[int], directory: str) -> None:
+    os.makedirs(directory, exist_ok=True)
+    source.import_team_desc().to_parquet(os.path.join(directory, 'teams.parquet'), index=False)
+    for season in seasons:
+        source.import_schedules([season]).to_parquet(os.path.join(directory, f"schedules_{season}.parquet"), index=False)
+        source.import_weekly_data([season]).to_parquet(os.path.join(directory, f"weekly_{season}.parquet"), index=False)
+        logger.info(f"Recorded {season} fixtures to {directory}")
@@ -1,39 +1,263 @@
 import json
 import os
+import re
+import pickle
+import hashlib
 import logging
-from src.config import RAW_DATA_DIR, PROCESSED_DATA_DIR
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+from src.config import DATA_DIR, RAW_DATA_DIR, PROCESSED_DATA_DIR
+from src.data.cache import CACHE_DIR
 
 os.makedirs(RAW_DATA_DIR, exist_ok=True)
 os.makedirs(PROCESSED_DATA_DIR, exist_ok=True)
 
 logger = logging.getLogger(__name__)
 
+JSON_CACHE_DIR = os.path.join(CACHE_DIR, "json")
+VERSION_SUFFIX = ".version"
+
+_json_memo: Dict[str, Tuple[Tuple[int, int], bytes]] = {}
+_json_stats = {'memo_hits': 0, 'disk_hits': 0, 'misses': 0}
+
 def get_file_path(filename: str, processed: bool = False) -> str:
     directory = PROCESSED_DATA_DIR if processed else RAW_DATA_DIR
     return os.path.join(directory, filename)
 
-def save_json(filename: str, data: any, processed: bool = False) -> None:
+def save_json(filename: str, data: any, processed: bool = False, version: Optional[int] = None) -> None:
     filepath = get_file_path(filename, processed)
     try:
         with open(filepath, 'w') as f:
             json.dump(data, f, indent=4)
+        _json_memo.pop(filepath, None)
+        if version is not None:
+            with open(f"{filepath}{VERSION_SUFFIX}", 'w') as f:
+                f.write(f"{version}\n")
         logger.info(f"Saved data to {filepath}")
     except Exception as e:
         logger.error(f"Failed to save {filepath}: {e}")
 
-def load_json(filename: str, processed: bool = False) -> any:
+def json_version(filename: str, processed: bool = False) -> Optional[int]:
+    try:
+        with open(f"{get_file_path(filename, processed)}{VERSION_SUFFIX}") as f:
+            return int(f.read().strip())
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _json_cache_path(filepath: str) -> str:
+    name = os.path.relpath(filepath, DATA_DIR).replace(os.sep, '__')
+    return os.path.join(JSON_CACHE_DIR, f"{name}.pkl")
+
+def _read_json_cache(filepath: str, stamp: Tuple[int, int]) -> Optional[bytes]:
+    cache_path = _json_cache_path(filepath)
+    try:
+        with open(cache_path, 'rb') as f:
+            meta = pickle.load(f)
+            payload = f.read()
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Discarding unreadable JSON cache {cache_path}: {e}")
+        return None
+
+    if (meta['mtime_ns'], meta['size']) == stamp:
+        return payload
+    if meta['size'] == stamp[1]:
+        with open(filepath, 'rb') as f:
+            if hashlib.sha256(f.read()).hexdigest() == meta['sha256']:
+                _write_json_cache(filepath, stamp, meta['sha256'], payload)
+                return payload
+    return None
+
+def _write_json_cache(filepath: str, stamp: Tuple[int, int], digest: str, payload: bytes) -> None:
+    cache_path = _json_cache_path(filepath)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(JSON_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'mtime_ns': stamp[0], 'size': stamp[1], 'sha256': digest}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.write(payload)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.warning(f"Failed to cache {filepath}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def load_json(filename: str, processed: bool = False, use_cache: bool = True, version: Optional[int] = None) -> any:
     filepath = get_file_path(filename, processed)
     if not os.path.exists(filepath):
         return None
+    if version is not None and json_version(filename, processed) != version:
+        logger.warning(f"{filepath} is format {json_version(filename, processed)}, expected {version}; treating it as stale")
+        return None
     
     try:
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-        logger.info(f"Loaded data from {filepath}")
+        if not use_cache:
+            with open(filepath, 'r') as f:
+                data = json.load(f)
+            logger.info(f"Loaded data from {filepath}")
+            return data
+
+        st = os.stat(filepath)
+        stamp = (st.st_mtime_ns, st.st_size)
+        memo = _json_memo.get(filepath)
+        if memo is not None and memo[0] == stamp:
+            _json_stats['memo_hits'] += 1
+            logger.debug(f"Loaded data from {filepath} (memoized)")
+            return pickle.loads(memo[1])
+
+        payload = _read_json_cache(filepath, stamp)
+        if payload is not None:
+            _json_stats['disk_hits'] += 1
+            logger.debug(f"Loaded data from {filepath} (binary cache)")
+            data = pickle.loads(payload)
+        else:
+            with open(filepath, 'rb') as f:
+                raw = f.read()
+            data = json.loads(raw)
+            payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+            _write_json_cache(filepath, stamp, hashlib.sha256(raw).hexdigest(), payload)
+            _json_stats['misses'] += 1
+            logger.info(f"Loaded data from {filepath}")
+
+        _json_memo[filepath] = (stamp, payload)
         return data
     except Exception as e:
         logger.error(f"Failed to load {filepath}: {e}")
         return None
 
+def json_cache_stats() -> Dict[str, int]:
+    return dict(_json_stats)
+
+def clear_json_cache() -> None:
+    _json_memo.clear()
+    if os.path.isdir(JSON_CACHE_DIR):
+        for name in os.listdir(JSON_CACHE_DIR):
+            os.remove(os.path.join(JSON_CACHE_DIR, name))
+
 def file_exists(filename: str, processed: bool = False) -> bool:
     return os.path.exists(get_file_path(filename, processed))
+
+COLUMNAR_FORMATS = ('.parquet', '.feather', '.arrow', '.npz')
+
+def records_to_frame(data) -> pd.DataFrame:
+    return data if isinstance(data, pd.DataFrame) else pd.DataFrame.from_records(data)
+
+def frame_to_records(df: pd.DataFrame) -> list:
+    if not df.isna().to_numpy().any():
+        return df.to_dict(orient='records')
+    return df.astype(object).where(df.notna(), None).to_dict(orient='records')
+
+def _save_npz(filepath: str, df: pd.DataFrame) -> None:
+    arrays = {}
+    schema = []
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+            arrays[f"col{len(schema)}"] = values.to_numpy()
+            schema.append({'name': col, 'kind': 'numeric'})
+        else:
+            mask = values.isna().to_numpy()
+            arrays[f"col{len(schema)}"] = values.fillna('').astype(str).to_numpy(dtype=str)
+            arrays[f"null{len(schema)}"] = mask
+            schema.append({'name': col, 'kind': 'string'})
+    arrays['schema'] = np.array(json.dumps(schema))
+    with open(filepath, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+
+def _load_npz(filepath: str, columns=None) -> dict:
+    with np.load(filepath, allow_pickle=False) as npz:
+        schema = json.loads(str(npz['schema']))
+        out = {}
+        for i, field in enumerate(schema):
+            if columns is not None and field['name'] not in columns:
+                continue
+            values = npz[f"col{i}"]
+            if field['kind'] == 'string':
+                values = values.astype(object)
+                values[npz[f"null{i}"]] = None
+            out[field['name']] = values
+    return out
+
+def save_table(filename: str, data, processed: bool = True) -> None:
+    filepath = get_file_path(filename, processed)
+    ext = os.path.splitext(filename)[1].lower()
+    try:
+        df = records_to_frame(data)
+        if ext == '.npz':
+            _save_npz(filepath, df)
+        elif ext == '.arrow':
+            _write_arrow(filepath, df)
+        elif ext == '.feather':
+            df.reset_index(drop=True).to_feather(filepath)
+        else:
+            df.to_parquet(filepath, index=False)
+        logger.info(f"Saved table to {filepath}")
+    except Exception as e:
+        logger.error(f"Failed to save {filepath}: {e}")
+
+def load_table(filename: str, processed: bool = True, columns=None, as_arrays: bool = False):
+    filepath = get_file_path(filename, processed)
+    if not os.path.exists(filepath):
+        return None
+    
+    ext = os.path.splitext(filename)[1].lower()
+    try:
+        if ext == '.npz':
+            arrays = _load_npz(filepath, columns)
+            return arrays if as_arrays else pd.DataFrame(arrays)
+        if ext == '.arrow':
+            df = _decode_dictionaries(_read_arrow(filepath, columns)).to_pandas()
+        elif ext == '.feather':
+            df = pd.read_feather(filepath, columns=columns)
+        else:
+            df = pd.read_parquet(filepath, columns=columns)
+        return {col: df[col].to_numpy() for col in df.columns} if as_arrays else df
+    except Exception as e:
+        logger.error(f"Failed to load {filepath}: {e}")
+        return None
+
+def _write_arrow(filepath: str, df: pd.DataFrame) -> None:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.feather as feather
+    table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            table = table.set_column(i, field.name, pc.dictionary_encode(table.column(i)))
+    feather.write_feather(table, filepath, compression='uncompressed')
+
+def _decode_dictionaries(table):
+    import pyarrow as pa
+    for i, field in enumerate(table.schema):
+        if pa.types.is_dictionary(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(field.type.value_type))
+    return table
+
+def _read_arrow(filepath: str, columns=None):
+    import pyarrow.feather as feather
+    return feather.read_table(filepath, columns=columns, memory_map=True)
+
+def load_arrow(filename: str, processed: bool = True, columns=None):
+    filepath = get_file_path(filename, processed)
+    if not os.path.exists(filepath):
+        return None
+    try:
+        return _read_arrow(filepath, columns)
+    except Exception as e:
+        logger.error(f"Failed to load {filepath}: {e}")
+        return None
+
+def is_stale(filename: str, source: str, processed: bool = True, source_processed: bool = False) -> bool:
+    target = get_file_path(filename, processed)
+    origin = get_file_path(source, source_processed)
+    if not os.path.exists(target):
+        return True
+    return os.path.exists(origin) and os.path.getmtime(origin) > os.path.getmtime(target)
+
+def available_seasons(processed: bool = False) -> list:
+    directory = PROCESSED_DATA_DIR if processed else RAW_DATA_DIR
+    pattern = re.compile(r"^schedules_nflverse_(\d{4})\.json$")
+    matches = (pattern.match(name) for name in os.listdir(directory))
+    return sorted(int(m.group(1)) for m in matches if m)
@@ -1,10 +1,18 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Tuple
+from src.features.store import TeamFeatureStore
 
 class FeatureProcessor:
-    def __init__(self):
-        pass
+    def __init__(self, form_window: int = 4):
+        self.form_window = form_window
+        self.store = TeamFeatureStore(form_window=form_window)
+
+    def update_store(self, games: List[Dict]) -> List[Tuple[int, int]]:
+        return self.store.extend(games)
+
+    def team_stats_as_of(self, season: int, week: int) -> pd.DataFrame:
+        return self.store.as_of(season, week)
 
     def process_team_stats(self, games: List[Dict], teams: List[Dict]) -> pd.DataFrame:
         if not games:
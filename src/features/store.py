@@ -0,0 +1,167 @@
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple, Union
+from src.data.games import GameTable
+
+logger = logging.getLogger(__name__)
+
+MAX_WEEK = 22
+DEFAULT_REST = 7
+
+CUMULATIVE = ('Games', 'Wins', 'Losses', 'Ties', 'PointsFor', 'PointsAllowed', 'PointDiff')
+FEATURES = CUMULATIVE + ('RestDays', 'LastGameDay', 'Form')
+
+
+class TeamFeatureStore:
+    def __init__(self, form_window: int = 4, max_week: int = MAX_WEEK):
+        self.form_window = form_window
+        self.max_week = max_week
+        self.teams: List[str] = []
+        self.team_index: Dict[str, int] = {}
+        self.seasons: Dict[int, int] = {}
+        self.latest: Dict[int, int] = {}
+        self.data: Dict[str, np.ndarray] = {f: np.empty((0, 0)) for f in FEATURES}
+        self._recent = np.empty((0, form_window))
+        self._recent_count = np.empty(0, dtype=np.int64)
+
+    @classmethod
+    def from_games(cls, games: Union[List[Dict], GameTable], form_window: int = 4, max_week: int = MAX_WEEK) -> 'TeamFeatureStore':
+        store = cls(form_window=form_window, max_week=max_week)
+        store.extend(games)
+        return store
+
+    def _team_ids(self, names) -> np.ndarray:
+        new = [t for t in dict.fromkeys(names) if t not in self.team_index]
+        if new:
+            for t in new:
+                self.team_index[t] = len(self.teams)
+                self.teams.append(t)
+            pad = len(new)
+            for f in FEATURES:
+                fill = 0.0 if f in CUMULATIVE else np.nan
+                self.data[f] = np.pad(self.data[f], ((0, 0), (0, pad)), constant_values=fill)
+            self._recent = np.pad(self._recent, ((0, pad), (0, 0)), constant_values=np.nan)
+            self._recent_count = np.pad(self._recent_count, (0, pad))
+        return np.array([self.team_index[t] for t in names], dtype=np.int64)
+
+    def _season_base(self, season: int) -> int:
+        if season in self.seasons:
+            return self.seasons[season]
+        if self.seasons and season < max(self.seasons):
+            raise ValueError(f"Season {season} is older than the latest stored season {max(self.seasons)}")
+
+        base = len(self.data['Games'])
+        rows = self.max_week + 1
+        carried = self.data['LastGameDay'][-1] if base else np.full(len(self.teams), np.nan)
+        rest = self.data['RestDays'][-1] if base else np.full(len(self.teams), np.nan)
+        for f in FEATURES:
+            block = np.zeros((rows, len(self.teams))) if f in CUMULATIVE else np.full((rows, len(self.teams)), np.nan)
+            self.data[f] = np.vstack([self.data[f], block])
+        self.data['LastGameDay'][base:] = carried
+        self.data['RestDays'][base:] = rest
+        self._recent[:] = np.nan
+        self._recent_count[:] = 0
+        self.seasons[season] = base
+        self.latest[season] = 0
+        return base
+
+    def append_week(self, season: int, week: int, games: Union[List[Dict], GameTable]):
+        games = [g for g in GameTable.as_records(games) if g.get('Status') == 'Final']
+        if not 1 <= week <= self.max_week:
+            raise ValueError(f"Week {week} is outside 1..{self.max_week}")
+        base = self._season_base(season)
+        if week <= self.latest[season]:
+            raise ValueError(f"Week {week} of {season} is already in the store (latest is {self.latest[season]})")
+
+        ids = self._team_ids([g['HomeTeam'] for g in games] + [g['AwayTeam'] for g in games])
+        row = base + week
+        for f in FEATURES:
+            self.data[f][row:base + self.max_week + 1] = self.data[f][row - 1]
+        self.latest[season] = week
+        if not games:
+            return
+
+        n = len(games)
+        home_score = np.array([g.get('HomeScore') or 0.0 for g in games], dtype=float)
+        away_score = np.array([g.get('AwayScore') or 0.0 for g in games], dtype=float)
+        points_for = np.concatenate([home_score, away_score])
+        points_against = np.concatenate([away_score, home_score])
+        diff = points_for - points_against
+
+        days = pd.to_datetime(pd.Series([g.get('Date') for g in games] * 2), errors='coerce')
+        day = (days - pd.Timestamp(0)).dt.days.to_numpy(dtype=float)
+        listed = np.array([g.get('HomeRest') for g in games] + [g.get('AwayRest') for g in games], dtype=float)
+        last = self.data['LastGameDay'][row - 1, ids]
+        rest = np.where(np.isnan(day - last), listed, day - last)
+        rest = np.where(np.isnan(rest), DEFAULT_REST, rest)
+
+        updates = {
+            'Games': np.ones(2 * n),
+            'Wins': (diff > 0).astype(float),
+            'Losses': (diff < 0).astype(float),
+            'Ties': (diff == 0).astype(float),
+            'PointsFor': points_for,
+            'PointsAllowed': points_against,
+            'PointDiff': diff,
+        }
+        tail = slice(row, base + self.max_week + 1)
+        for f, values in updates.items():
+            self.data[f][tail] += np.bincount(ids, weights=values, minlength=len(self.teams))
+
+        self.data['RestDays'][tail, ids] = rest
+        self.data['LastGameDay'][tail, ids] = np.where(np.isnan(day), last + rest, day)
+
+        slot = self._recent_count[ids] % self.form_window
+        self._recent[ids, slot] = diff
+        self._recent_count[ids] += 1
+        self.data['Form'][tail, ids] = np.nanmean(self._recent[ids], axis=1)
+
+    def extend(self, games: Union[List[Dict], GameTable]) -> List[Tuple[int, int]]:
+        records = GameTable.as_records(games)
+        weeks: Dict[Tuple[int, int], List[Dict]] = {}
+        for g in records:
+            weeks.setdefault((int(g['Season']), int(g['Week'])), []).append(g)
+
+        appended = []
+        for season, week in sorted(weeks):
+            if week <= self.latest.get(season, 0) or (self.seasons and season < max(self.seasons)):
+                continue
+            if not all(g.get('Status') == 'Final' for g in weeks[(season, week)]):
+                break
+            self.append_week(season, week, weeks[(season, week)])
+            appended.append((season, week))
+        if appended:
+            logger.debug(f"Appended {len(appended)} weeks to the team feature store")
+        return appended
+
+    def _row(self, season: int, week: int) -> int:
+        if season not in self.seasons:
+            raise KeyError(f"Season {season} is not in the feature store")
+        return self.seasons[season] + min(max(week, 1), self.max_week + 1) - 1
+
+    def lookup(self, season: int, week: int, team: str) -> Dict[str, float]:
+        row, col = self._row(season, week), self.team_index[team]
+        return {f: float(self.data[f][row, col]) for f in FEATURES}
+
+    def values(self, feature: str, season: int, week: int, teams) -> np.ndarray:
+        return self.data[feature][self._row(season, week), [self.team_index[t] for t in teams]]
+
+    def matchup(self, season: int, week: int, home: str, away: str) -> Dict[str, float]:
+        h, a = self.lookup(season, week, home), self.lookup(season, week, away)
+        return {**{f"home_{k}": v for k, v in h.items()}, **{f"away_{k}": v for k, v in a.items()}}
+
+    def as_of(self, season: int, week: int) -> pd.DataFrame:
+        row = self._row(season, week)
+        stats = pd.DataFrame({'Team': self.teams, **{f: self.data[f][row] for f in FEATURES}})
+        for f in ('Games', 'Wins', 'Losses', 'Ties'):
+            stats[f] = stats[f].astype(int)
+        games = stats['Games'].where(stats['Games'] > 0)
+        stats['WinPct'] = stats['Wins'] / games
+        stats['PPG'] = stats['PointsFor'] / games
+        stats['PAPG'] = stats['PointsAllowed'] / games
+        stats['NetPointDiff'] = stats['PointDiff'] / games
+        return stats
+
+    def season_totals(self, season: int) -> pd.DataFrame:
+        return self.as_of(season, self.max_week + 1)
@@ -2,6 +2,7 @@ import argparse
 import sys
 import logging
 import random
+import time
 from datetime import datetime
 from src.config import DEFAULT_SEASON, SIMULATION_RUNS
 from src.data.client import NFLVerseClient
@@ -15,60 +16,44 @@ from src.models.qb_elo import QBEloModel
 from src.models.hfa import DynamicHFAModel
 from src.models.bias import BiasModel
 from src.models.epa import EPAModel
+from src.models.bootstrap import bootstrap_ratings
+from src.models.training import TrainingGraph, TrainingTask, model_cache
+from src.models.validation import TimeSeriesCV, cv_summary
 from src.utils.upsets import UpsetDetector
 from src.models.predictor import GamePredictor
 from src.simulation.engine import SeasonSimulator
 from src.simulation.evaluator import Evaluator
+from src.simulation.backtest import WalkForwardBacktest, summarize, run_backtests, run_prediction_table, backtest_cache, BACKTEST_CONFIGS
+from src.simulation.metrics import backtest_report
+from src.simulation.teardown import teardown_tables, write_teardown
+from src.simulation.predictions import predict_week, export_predictions
 
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
-def print_predictions(games, predictor):
+def print_predictions(table):
     print("\n=== GAME PREDICTIONS (Ensemble + Vegas) ===")
     print(f"Model Spread vs Vegas Line analysis")
     print("-" * 125)
     print(f"{'Matchup':<25} | {'Pred Score':<15} | {'Win %':<8} | {'Model':<8} | {'Vegas':<8} | {'Value':<8} | {'Ratings'}")
     print("-" * 125)
     
-    for game in games:
-        home = game['HomeTeam']
-        away = game['AwayTeam']
-        h_rest = game.get('HomeRest', 7)
-        a_rest = game.get('AwayRest', 7)
-        h_qb = game.get('home_qb_name')
-        a_qb = game.get('away_qb_name')
-        
-        vegas_line = game.get('spread_line', 0.0)
-        
-        if h_rest is None: h_rest = 7
-        if a_rest is None: a_rest = 7
-        
-        pred = predictor.predict_matchup(home, away, is_neutral=False, 
-                                         home_rest=int(h_rest), away_rest=int(a_rest),
-                                         home_qb=h_qb, away_qb=a_qb,
-                                         vegas_line=float(vegas_line))
-        p_home = pred['HomeWinProbability'] * 100
-        spread = pred['EstimatedSpread']
-        score_home = pred['PredictedHomeScore']
-        score_away = pred['PredictedAwayScore']
+    for row in table.itertuples(index=False):
+        home = row.HomeTeam
+        away = row.AwayTeam
+        p_home = row.HomeWinProb * 100
         
         matchup_str = f"{away} @ {home}"
-        score_str = f"{away} {score_away} - {home} {score_home}"
-        
-        model_str = f"{spread:.1f}"
-        vegas_str = f"{vegas_line:.1f}"
-        
-        diff = spread - vegas_line
-        value_str = f"{diff:.1f}"
+        score_str = f"{away} {row.PredAwayScore} - {home} {row.PredHomeScore}"
         
         if p_home > 50:
             win_prob_str = f"{home} {p_home:.0f}%"
         else:
             win_prob_str = f"{away} {100-p_home:.0f}%"
             
-        rating_info = f"{pred['HomeRating']}/{pred['AwayRating']}"
+        rating_info = f"{row.HomeRating}/{row.AwayRating}"
             
-        print(f"{matchup_str:<25} | {score_str:<15} | {win_prob_str:<8} | {model_str:<8} | {vegas_str:<8} | {value_str:<8} | {rating_info}")
+        print(f"{matchup_str:<25} | {score_str:<15} | {win_prob_str:<8} | {row.PredSpread:<8.1f} | {row.VegasLine:<8.1f} | {row.VegasDiff:<8.1f} | {rating_info}")
     
     print("-" * 125)
 
@@ -77,130 +62,49 @@ def print_predictions(games, predictor):
     print(f"{'Matchup':<25} | {'Vegas Fav':<15} | {'Model Pick':<15} | {'Value'}")
     print("-" * 80)
     
-    found_contrarian = False
-    for game in games:
-        home = game['HomeTeam']
-        away = game['AwayTeam']
+    contrarian = table[table['Contrarian']]
+    for row in contrarian.itertuples(index=False):
+        home = row.HomeTeam
+        away = row.AwayTeam
+        spread = row.PredSpread
+        vegas_line = row.VegasLine
         
-        vegas_line = game.get('spread_line', 0.0)
-        
-        h_rest = game.get('HomeRest', 7)
-        if h_rest is None: h_rest = 7
-        a_rest = game.get('AwayRest', 7)
-        if a_rest is None: a_rest = 7
-        h_qb = game.get('home_qb_name')
-        a_qb = game.get('away_qb_name')
-
-        pred = predictor.predict_matchup(home, away, is_neutral=False, 
-                                         home_rest=int(h_rest), away_rest=int(a_rest),
-                                         home_qb=h_qb, away_qb=a_qb,
-                                         vegas_line=float(vegas_line))
-        spread = pred['EstimatedSpread']
-        
-        if spread < 0 and vegas_line > 0:
-            found_contrarian = True
+        if spread < 0:
             vegas_fav = f"{away} ({-vegas_line:.1f})"
             model_pick = f"{home} ({-spread:.1f})"
-            diff = abs(spread - vegas_line)
-            print(f"{away} @ {home:<21} | {vegas_fav:<15} | {model_pick:<15} | {diff:.1f}")
-            
-        elif spread > 0 and vegas_line < 0:
-            found_contrarian = True
+        else:
             vegas_fav = f"{home} ({vegas_line:.1f})"
             model_pick = f"{away} ({spread:.1f})"
-            diff = abs(spread - vegas_line)
-            print(f"{away} @ {home:<21} | {vegas_fav:<15} | {model_pick:<15} | {diff:.1f}")
+        print(f"{away} @ {home:<21} | {vegas_fav:<15} | {model_pick:<15} | {abs(row.VegasDiff):.1f}")
 
-    if not found_contrarian:
+    if contrarian.empty:
         print("No disagreements found for this week.")
     print("-" * 80)
 
-def run_backtest(schedule, teams, model_type='ensemble'):
+    traps = table[table['TrapGame']]
+    if not traps.empty:
+        print(f"Trap games: {', '.join(f'{a} @ {h}' for a, h in zip(traps['AwayTeam'], traps['HomeTeam']))}")
+
+def run_backtest(schedule, teams, model_type='ensemble', use_cache=True):
     print("\n=== RUNNING SEASON BACKTEST ===")
     print("Simulating season week-by-week (No Future Knowledge)...")
     
-    weeks = sorted(list(set(g['Week'] for g in schedule if g['Status'] == 'Final' and g['Season'] == DEFAULT_SEASON)))
-    
-    total_games = 0
-    correct_picks = 0
-    ae_spread = 0
-    spread_count = 0
+    backtest = WalkForwardBacktest(schedule, DEFAULT_SEASON)
+    records = backtest.run(cache=backtest_cache() if use_cache else None)
+    summary = summarize(records)
     
-    contrarian_wins = 0
-    contrarian_losses = 0
-    
-    for week in weeks:
-        print(f"Testing Week {week}...", end='\r')
-        
-        train_data = [g for g in schedule if g['Week'] < week and g['Status'] == 'Final']
-        
-        elo = EloModel(k_factor=50, hfa=40)
-        pyth = PythagoreanModel()
-        srs = SRSModel()
-        form = RecentFormModel()
-        power = PowerRatingModel()
-        qb = QBEloModel()
-        hfa = DynamicHFAModel()
-        epa = EPAModel()
-        
-        elo.train(train_data)
-        pyth.train(train_data)
-        srs.train(train_data)
-        form.train(train_data)
-        power.train(train_data)
-        qb.train(train_data)
-        hfa.train(train_data)
-        epa.train(train_data)
-        
-        predictor = GamePredictor(elo, pyth, srs, form, power, qb, hfa, epa_model=epa, upset_detector=UpsetDetector())
-        
-        week_games = [g for g in schedule if g['Week'] == week and g['Status'] == 'Final']
-        
-        for g in week_games:
-            home = g['HomeTeam']
-            away = g['AwayTeam']
-            actual_home_score = g['HomeScore']
-            actual_away_score = g['AwayScore']
-            actual_margin = actual_home_score - actual_away_score
-            actual_winner = home if actual_home_score > actual_away_score else away
-            
-            h_rest = g.get('HomeRest', 7) or 7
-            a_rest = g.get('AwayRest', 7) or 7
-            h_qb = g.get('home_qb_name')
-            a_qb = g.get('away_qb_name')
-            
-            vegas_val = g.get('spread_line', 0.0)
-            p = predictor.predict_matchup(home, away, home_rest=int(h_rest), away_rest=int(a_rest),
-                                          home_qb=h_qb, away_qb=a_qb,
-                                          vegas_line=float(vegas_val))
-            
-            pred_spread = p['EstimatedSpread']
-            pred_winner = home if pred_spread < 0 else away
-            
-            if pred_winner == actual_winner:
-                correct_picks += 1
-            total_games += 1
-            
-            error = abs(pred_spread - (-actual_margin))
-            ae_spread += error
-            spread_count += 1
-            
-            vegas = g.get('spread_line', 0.0)
-            if vegas != 0.0:
-                if pred_spread < 0 and vegas > 0:
-                    if actual_winner == home: contrarian_wins += 1
-                    else: contrarian_losses += 1
-                elif pred_spread > 0 and vegas < 0:
-                    if actual_winner == away: contrarian_wins += 1
-                    else: contrarian_losses += 1
+    total_games = summary['games']
+    correct_picks = summary['correct']
+    contrarian_wins = summary['contrarian_wins']
+    contrarian_losses = summary['contrarian_losses']
 
     print("\n" + "-"*50)
-    print(f"BACKTEST RESULTS (Weeks {min(weeks)}-{max(weeks)})")
+    print(f"BACKTEST RESULTS (Weeks {summary['first_week']}-{summary['last_week']})")
     print("-"*50)
     print(f"Total Games Analyzed: {total_games}")
     if total_games > 0:
         print(f"Straight Up Accuracy: {correct_picks}/{total_games} ({correct_picks/total_games:.1%})")
-        print(f"Avg Spread Error:     {ae_spread/spread_count:.2f} points")
+        print(f"Avg Spread Error:     {summary['mean_spread_error']:.2f} points")
     
     print("-"*50)
     print("CONTRARIAN PERFORMANCE (Model vs Vegas)")
@@ -211,24 +115,138 @@ def run_backtest(schedule, teams, model_type='ensemble'):
     else:
         print("No major disagreements found in sample.")
     print("-"*50)
+    if use_cache:
+        weeks = backtest.cache_hits + backtest.cache_misses
+        print(f"Week cache: {backtest.cache_hits}/{weeks} hits, {backtest.cache_misses} week(s) recomputed")
+        print("-"*50)
+
+def run_parallel_backtests(seasons, config_names, max_workers=None, use_cache=True):
+    print("\n=== RUNNING PARALLEL BACKTESTS ===")
+    configs = [BACKTEST_CONFIGS[name] for name in config_names]
+    start = time.perf_counter()
+    df = run_backtests(seasons, configs, max_workers=max_workers, use_cache=use_cache)
+    elapsed = time.perf_counter() - start
+    
+    if df.empty:
+        logger.error("No backtests completed.")
+        return
+    
+    cols = ['Season', 'Config', 'games', 'accuracy', 'mean_spread_error', 'contrarian_wins', 'contrarian_losses', 'cache_hits', 'cache_misses', 'seconds']
+    print(df[cols].to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+    print("-"*50)
+    print(f"{len(df)} backtests in {elapsed:.2f}s wall ({df['seconds'].sum():.2f}s total work)")
+    if use_cache:
+        hits, misses = df['cache_hits'].sum(), df['cache_misses'].sum()
+        print(f"Week cache hit rate: {hits}/{hits + misses} ({hits / max(hits + misses, 1):.1%})")
+
+def run_backtest_report(seasons, config_names, max_workers=None, use_cache=True):
+    print(f"\n=== BACKTEST REPORT ({', '.join(str(s) for s in seasons)}) ===")
+    configs = [BACKTEST_CONFIGS[name] for name in config_names]
+    df = run_prediction_table(seasons, configs, max_workers=max_workers, use_cache=use_cache)
+    
+    if df.empty:
+        logger.error("No backtests completed.")
+        return
+    
+    report = backtest_report(df)
+    storage.save_table("backtest_predictions.parquet", df)
+    for name, table in report.items():
+        storage.save_table(f"backtest_{name}.parquet", table)
+    
+    cols = ['Config', 'Season', 'games', 'accuracy', 'brier', 'log_loss', 'mean_spread_error', 'ats_wins', 'ats_losses', 'ats_pushes', 'ats_win_rate']
+    print(report['seasons'][cols].to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+    print("-"*50)
+    print("CALIBRATION")
+    cal_cols = ['Config', 'bin_lo', 'bin_hi', 'games', 'mean_predicted', 'observed']
+    print(report['calibration'][cal_cols].to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+    print("-"*50)
+
+def run_teardown(seasons, config_names, max_workers=None, use_cache=True):
+    print(f"\n=== ERROR TEARDOWN ({', '.join(str(s) for s in seasons)}) ===")
+    configs = [BACKTEST_CONFIGS[name] for name in config_names]
+    df = run_prediction_table(seasons, configs, max_workers=max_workers, use_cache=use_cache)
+    
+    if df.empty:
+        logger.error("No backtests completed.")
+        return
+    
+    start = time.perf_counter()
+    tables = teardown_tables(df)
+    elapsed = time.perf_counter() - start
+    write_teardown(tables)
+    
+    for name, table in tables.items():
+        print(f"{name:<20} {len(table):>6} rows")
+    print(f"Built from {len(df)} predictions in {elapsed * 1000:.1f} ms")
+    print("-"*50)
+
+def run_cross_validation(seasons, fold, max_workers=None):
+    print(f"\n=== TIME-SERIES CV ({fold} folds, {', '.join(str(s) for s in seasons)}) ===")
+    games = [g for _, schedule in NFLVerseClient().iter_schedules(seasons) for g in schedule]
+    
+    cv = TimeSeriesCV(games, fold=fold, max_workers=max_workers)
+    folds = cv.run()
+    
+    if folds.empty:
+        logger.error("No folds completed.")
+        return
+    
+    storage.save_table(f"cv_{fold}_folds.parquet", folds)
+    print(cv_summary(folds).to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+    print("-"*50)
+    print(f"Features built in {cv.matrices.seconds * 1000:.0f} ms, {len(folds)} fold fits in {cv.wall_time:.2f} s")
 
 def main():
     parser = argparse.ArgumentParser(description="NFL Playoff & Championship Predictor (NFLVerse)")
     parser.add_argument("--season", type=int, default=DEFAULT_SEASON, help="Season to simulate")
     parser.add_argument("--sims", type=int, default=SIMULATION_RUNS, help="Number of simulations")
-    parser.add_argument("--refresh", action="store_true", help="Force refresh of data from NFLVerse")
+    parser.add_argument("--refresh", action="store_true", help="Refresh data from NFLVerse, re-merging only games whose status or score changed")
+    parser.add_argument("--full-refresh", action="store_true", help="Re-download and rebuild the full season schedule from NFLVerse")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the model and backtest caches and recompute everything")
     parser.add_argument("--week", type=int, help="Start simulation from this week (Time Travel)")
     parser.add_argument("--predict", action="store_true", help="Predict games for the specified week")
+    parser.add_argument("--export", type=str, help="With --predict, write the week's prediction table to a .json, .csv or .parquet file")
     parser.add_argument("--backtest", action="store_true", help="Run historical backtest validation")
+    parser.add_argument("--bootstrap", type=int, default=0, help="Resample completed games N times for rating intervals and per-sim rating draws")
+    parser.add_argument("--seasons", type=int, nargs='+', help="Backtest several seasons in parallel")
+    parser.add_argument("--configs", type=str, nargs='+', choices=sorted(BACKTEST_CONFIGS), default=['ensemble'], help="Model configurations for parallel backtests")
+    parser.add_argument("--report", action="store_true", help="Write per-game predictions and probabilistic backtest metrics to data/processed")
+    parser.add_argument("--teardown", action="store_true", help="Regenerate the results/ error-analysis tables (CSV and Parquet) from a backtest")
+    parser.add_argument("--clinch", action="store_true", help="Report clinched/eliminated teams from current standings and the remaining schedule")
+    parser.add_argument("--prune", action="store_true", help="Skip rating updates for games between eliminated teams in Monte Carlo simulations")
+    parser.add_argument("--analytic", action="store_true", help="Exact win-total distributions instead of Monte Carlo season simulations")
+    parser.add_argument("--win-line", type=float, help="With --analytic, print over/under probabilities for this win total")
+    parser.add_argument("--cv", type=str, choices=['week', 'season'], help="Rolling-origin cross-validation of the sklearn models over --seasons")
+    parser.add_argument("--workers", type=int, help="Worker processes for parallel backtests (default: all cores)")
     parser.add_argument("--model", type=str, choices=['elo', 'pyth', 'srs', 'form', 'power', 'ensemble'], default='ensemble', help="Model to use")
     
     args = parser.parse_args()
     
+    if args.cv:
+        run_cross_validation(args.seasons or storage.available_seasons(), args.cv, args.workers)
+        return
+    
+    if args.backtest and args.teardown:
+        run_teardown(args.seasons or storage.available_seasons(), args.configs, args.workers, not args.no_cache)
+        return
+    
+    if args.backtest and args.report:
+        run_backtest_report(args.seasons or storage.available_seasons(), args.configs, args.workers, not args.no_cache)
+        return
+    
+    if args.backtest and args.seasons:
+        run_parallel_backtests(args.seasons, args.configs, args.workers, not args.no_cache)
+        return
+    
     client = NFLVerseClient()
     logger.info(f"Fetching data for {args.season}...")
     
-    teams = client.get_teams(force_refresh=args.refresh)
-    schedule = client.get_schedules(args.season, force_refresh=args.refresh)
+    teams = client.get_teams(force_refresh=args.refresh or args.full_refresh)
+    if args.refresh and not args.full_refresh:
+        schedule, changed = client.refresh_schedules(args.season)
+        logger.info(f"{len(changed)} game(s) changed since the cached schedule")
+    else:
+        schedule = client.get_schedules(args.season, force_refresh=args.full_refresh)
     
     if not teams or not schedule:
         logger.error("Failed to acquire data.")
@@ -238,7 +256,7 @@ def main():
     teams = [t for t in teams if t['Key'] in active_team_abbrs]
     
     if args.backtest:
-        run_backtest(schedule, teams, args.model)
+        run_backtest(schedule, teams, args.model, use_cache=not args.no_cache)
         return
 
     logger.info(f"Loaded {len(teams)} teams and {len(schedule)} games.")
@@ -246,50 +264,36 @@ def main():
     train_limit_week = args.week if args.week else 100 
     training_schedule = [g for g in schedule if g['Week'] < train_limit_week] if args.week else schedule
         
-    elo_model = None
-    pyth_model = None
-    srs_model = None
-    form_model = None
-    power_model = None
-    qb_model_inst = None
-    
     is_ens = (args.model == 'ensemble')
     
+    tasks = []
     if args.model == 'elo' or is_ens:
-        logger.info("Training Elo Model...")
-        elo_model = EloModel(k_factor=50, hfa=40)
-        elo_model.train(training_schedule)
-        
+        tasks.append(TrainingTask('elo', EloModel, {'k_factor': 50, 'hfa': 40}))
     if args.model == 'pyth' or is_ens:
-        logger.info("Training Pythagorean Model...")
-        pyth_model = PythagoreanModel()
-        pyth_model.train(training_schedule)
-        
+        tasks.append(TrainingTask('pyth', PythagoreanModel))
     if args.model == 'srs' or is_ens:
-        logger.info("Training SRS Model...")
-        srs_model = SRSModel()
-        srs_model.train(training_schedule)
-        
+        tasks.append(TrainingTask('srs', SRSModel))
     if args.model == 'form' or is_ens:
-        logger.info("Training Recent Form Model...")
-        form_model = RecentFormModel()
-        form_model.train(training_schedule)
-        
+        tasks.append(TrainingTask('form', RecentFormModel))
     if args.model == 'power' or is_ens:
-        logger.info("Training Power Rating Model...")
-        power_model = PowerRatingModel()
-        power_model.train(training_schedule)
-        
+        tasks.append(TrainingTask('power', PowerRatingModel))
     if is_ens or 'qb' in args.model:
-        logger.info("Training QB Elo Model...")
-        qb_model_inst = QBEloModel()
-        qb_model_inst.train(training_schedule)
+        tasks.append(TrainingTask('qb', QBEloModel))
+    if is_ens:
+        tasks.append(TrainingTask('hfa', DynamicHFAModel))
     
-    hfa_model = None
-    if is_ens: 
-        logger.info("Training Dynamic HFA Model...")
-        hfa_model = DynamicHFAModel()
-        hfa_model.train(training_schedule)
+    logger.info(f"Training {len(tasks)} model(s): {', '.join(t.name for t in tasks)}")
+    graph = TrainingGraph(tasks, cache=None if args.no_cache else model_cache())
+    trained = graph.run(training_schedule)
+    logger.info(f"Training finished in {graph.wall_time * 1000:.1f} ms")
+    
+    elo_model = trained.get('elo')
+    pyth_model = trained.get('pyth')
+    srs_model = trained.get('srs')
+    form_model = trained.get('form')
+    power_model = trained.get('power')
+    qb_model_inst = trained.get('qb')
+    hfa_model = trained.get('hfa')
     
     predictor = GamePredictor(
         elo_model=elo_model, 
@@ -315,12 +319,33 @@ def main():
                      
         logger.info(f"Generating Predictions for Week {target_week}...")
         week_games = [g for g in schedule if g['Week'] == target_week]
-        print_predictions(week_games, predictor)
+        table = predict_week(week_games, predictor)
+        print_predictions(table)
+        if args.export:
+            export_predictions(table, args.export)
+        
+    elif args.clinch:
+        simulator = SeasonSimulator(schedule, teams, predictor)
+        Evaluator.print_clinch_status(simulator.clinch_status(start_week=args.week), simulator.teams_map)
+        
+    elif args.analytic:
+        simulator = SeasonSimulator(schedule, teams, predictor)
+        start = time.perf_counter()
+        table = simulator.win_totals(start_week=args.week)
+        logger.info(f"Exact win distributions computed in {(time.perf_counter() - start) * 1000:.1f} ms")
+        Evaluator.print_win_totals(table, simulator.teams_map, args.win_line)
         
     else:
         logger.info(f"Starting {args.sims} simulations from Week {args.week if args.week else 'Current'}...")
+        bootstrap = None
+        if args.bootstrap:
+            logger.info(f"Bootstrapping ratings over {args.bootstrap} resamples...")
+            bootstrap = bootstrap_ratings(training_schedule, n_replicates=args.bootstrap)
+            print("\n=== RATING INTERVALS (90%) ===")
+            print(bootstrap.intervals().round(1).to_string(index=False))
+        
         simulator = SeasonSimulator(schedule, teams, predictor)
-        results = simulator.simulate(n_simulations=args.sims, start_week=args.week)
+        results = simulator.simulate(n_simulations=args.sims, start_week=args.week, bootstrap=bootstrap, prune=args.prune)
         Evaluator.aggregate_and_print(results, args.sims, simulator.teams_map)
     
 if __name__ == "__main__":
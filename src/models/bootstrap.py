@@ -0,0 +1,176 @@
+import random
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Union
+from src.models.elo import EloModel
+from src.models.srs import SRSModel
+from src.models.power import PowerRatingModel
+from src.data.games import GameTable
+
+
+class BootstrapRatings:
+    def __init__(self, teams: List[str], games_played: np.ndarray, team_games: np.ndarray, elo: np.ndarray,
+                 srs: np.ndarray, off: np.ndarray, defense: np.ndarray, league_avg: np.ndarray, elo_params: Dict):
+        self.teams = teams
+        self.team_index = {t: i for i, t in enumerate(teams)}
+        self.games_played = games_played
+        self.team_games = team_games
+        self.elo = elo
+        self.srs = srs
+        self.off = off
+        self.defense = defense
+        self.league_avg = league_avg
+        self.elo_params = elo_params
+
+    @property
+    def n_replicates(self) -> int:
+        return self.elo.shape[0]
+
+    def intervals(self, alpha: float = 0.10) -> pd.DataFrame:
+        lo, hi = 100 * alpha / 2, 100 * (1 - alpha / 2)
+        power = self.off + self.defense
+
+        df = pd.DataFrame({'Team': self.teams})
+        for name, values in (('Elo', self.elo), ('SRS', self.srs), ('Power', power)):
+            df[name] = np.median(values, axis=0)
+            df[f'{name}_Lo'] = np.percentile(values, lo, axis=0)
+            df[f'{name}_Hi'] = np.percentile(values, hi, axis=0)
+            df[f'{name}_SD'] = values.std(axis=0)
+        df['Games'] = self.games_played
+
+        return df.sort_values('Elo', ascending=False).reset_index(drop=True)
+
+    def replicate(self, b: int) -> Dict:
+        elo = EloModel(**self.elo_params)
+        srs = SRSModel()
+        power = PowerRatingModel()
+
+        played = self.team_games[b] > 0
+        for t, i in self.team_index.items():
+            elo.ratings[t] = float(self.elo[b, i])
+            if played[i]:
+                srs.ratings[t] = float(self.srs[b, i])
+                power.off_ratings[t] = float(self.off[b, i])
+                power.def_ratings[t] = float(self.defense[b, i])
+        power.league_avg_score = float(self.league_avg[b])
+
+        return {'elo': elo, 'srs': srs, 'power': power}
+
+    def sample(self) -> Dict:
+        return self.replicate(random.randrange(self.n_replicates))
+
+
+def _game_arrays(games):
+    table = GameTable.coerce(games)
+    final = table.final_index()
+    played = np.union1d(table.home[final], table.away[final])
+    teams = sorted(table.teams[played].tolist())
+    index = {t: i for i, t in enumerate(teams)}
+    remap = np.full(len(table.teams), -1, dtype=np.int64)
+    remap[played] = [index[t] for t in table.teams[played].tolist()]
+
+    home = remap[table.home[final]]
+    away = remap[table.away[final]]
+    h_score = table.home_score[final]
+    a_score = table.away_score[final]
+    h_to = table.stats['home_turnovers'][final]
+    a_to = table.stats['away_turnovers'][final]
+
+    return teams, home, away, h_score, a_score, h_to, a_to
+
+
+def _batched_srs(counts, home, away, h_score, a_score, n_teams, iterations):
+    n_games = len(home)
+    H = np.zeros((n_games, n_teams))
+    A = np.zeros((n_games, n_teams))
+    H[np.arange(n_games), home] = 1.0
+    A[np.arange(n_games), away] = 1.0
+
+    team_games = counts @ (H + A)
+    safe_games = np.where(team_games > 0, team_games, 1.0)
+
+    pair = np.zeros((n_games, n_teams * n_teams))
+    pair[np.arange(n_games), home * n_teams + away] = 1.0
+    meetings = (counts @ pair).reshape(-1, n_teams, n_teams)
+    meetings = meetings + meetings.transpose(0, 2, 1)
+    opp_avg = meetings / safe_games[:, :, None]
+
+    margin = h_score - a_score
+    avg_margin = (counts @ (margin[:, None] * (H - A))) / safe_games
+
+    srs = avg_margin.copy()
+    for _ in range(iterations):
+        srs = avg_margin + np.einsum('btu,bu->bt', opp_avg, srs)
+
+    total = counts.sum(axis=1, keepdims=True)
+    league_avg = (counts @ (h_score + a_score)) / (2.0 * total[:, 0])
+    avg_for = (counts @ (h_score[:, None] * H + a_score[:, None] * A)) / safe_games
+    avg_allowed = (counts @ (a_score[:, None] * H + h_score[:, None] * A)) / safe_games
+
+    off = avg_for - league_avg[:, None]
+    defense = league_avg[:, None] - avg_allowed
+    base_off, base_def = off.copy(), defense.copy()
+    for _ in range(iterations):
+        new_off = base_off + np.einsum('btu,bu->bt', opp_avg, defense)
+        new_def = base_def + np.einsum('btu,bu->bt', opp_avg, off)
+        off, defense = new_off, new_def
+
+    played = team_games > 0
+    return np.where(played, srs, 0.0), np.where(played, off, 0.0), np.where(played, defense, 0.0), league_avg, team_games
+
+
+def _batched_elo(counts, home, away, h_score, a_score, h_to, a_to, n_teams, base_rating, k_factor, hfa):
+    n_rep = counts.shape[0]
+    ratings = np.full((n_rep, n_teams), float(base_rating))
+
+    result = np.where(h_score > a_score, 1.0, np.where(a_score > h_score, 0.0, 0.5))
+    multiplier = np.ones(len(home))
+    multiplier[(result == 1.0) & (h_to > a_to)] = 0.5
+    multiplier[(result == 0.0) & (a_to > h_to)] = 0.5
+    multiplier[(result == 0.0) & (h_to > a_to)] = 0.7
+    multiplier[(result == 1.0) & (a_to > h_to)] = 0.7
+
+    for g in range(len(home)):
+        h, a = home[g], away[g]
+        reps = counts[:, g]
+        for k in range(int(reps.max())):
+            active = reps > k
+            ra = ratings[active, h]
+            rb = ratings[active, a]
+            ea = 1.0 / (1.0 + 10 ** ((rb - (ra + hfa)) / 400.0))
+            change = k_factor * (result[g] - ea) * multiplier[g]
+            ratings[active, h] = ra + change
+            ratings[active, a] = rb - change
+
+    return ratings
+
+
+def bootstrap_ratings(games: Union[List[Dict], GameTable], n_replicates: int = 1000, seed: Optional[int] = None,
+                      elo_params: Optional[Dict] = None, iterations: int = 10) -> BootstrapRatings:
+    elo_params = elo_params or {'k_factor': 50, 'hfa': 40}
+    defaults = EloModel(**elo_params)
+
+    teams, home, away, h_score, a_score, h_to, a_to = _game_arrays(games)
+    n_games = len(home)
+
+    rng = np.random.default_rng(seed)
+    if n_games:
+        counts = rng.multinomial(n_games, np.full(n_games, 1.0 / n_games), size=n_replicates).astype(float)
+    else:
+        counts = np.zeros((n_replicates, 0))
+
+    srs, off, defense, league_avg, team_games = _batched_srs(counts, home, away, h_score, a_score, len(teams), iterations)
+    elo = _batched_elo(counts.astype(np.int64), home, away, h_score, a_score, h_to, a_to, len(teams),
+                       defaults.base_rating, defaults.k_factor, defaults.hfa)
+
+    games_played = np.bincount(home, minlength=len(teams)) + np.bincount(away, minlength=len(teams))
+    return BootstrapRatings(teams, games_played, team_games, elo, srs, off, defense, league_avg, elo_params)
+
+
+def elo_parity(games: Union[List[Dict], GameTable], elo_params: Optional[Dict] = None) -> float:
+    elo = EloModel(**(elo_params or {'k_factor': 50, 'hfa': 40}))
+    teams, home, away, h_score, a_score, h_to, a_to = _game_arrays(games)
+    batched = _batched_elo(np.ones((1, len(home)), dtype=np.int64), home, away, h_score, a_score, h_to, a_to, len(teams),
+                           elo.base_rating, elo.k_factor, elo.hfa)
+    elo.train(games)
+    return float(np.abs(batched[0] - np.array([elo.get_rating(t) for t in teams])).max()) if teams else 0.0
@@ -1,14 +1,24 @@
+import time
+import logging
 import numpy as np
 from typing import Dict, List
 from sklearn.ensemble import RandomForestClassifier
+from src.data.games import GameTable
+
+logger = logging.getLogger(__name__)
 
 class ChampionshipPredictor:
-    def __init__(self):
+    def __init__(self, n_estimators: int = 300, max_depth: int = 12, min_samples_split: int = 10,
+                 min_samples_leaf: int = 5, n_jobs: int = -1, refresh_trees: int = 100, full_refit_every: int = 4):
+        self.n_estimators = n_estimators
+        self.refresh_trees = min(refresh_trees, n_estimators)
+        self.full_refit_every = full_refit_every
+        self.n_jobs = n_jobs
         self.model = RandomForestClassifier(
-            n_estimators=300,
-            max_depth=12,
-            min_samples_split=10,
-            min_samples_leaf=5,
+            n_estimators=n_estimators,
+            max_depth=max_depth,
+            min_samples_split=min_samples_split,
+            min_samples_leaf=min_samples_leaf,
             max_features='sqrt',
             bootstrap=True,
             random_state=42,
@@ -17,6 +27,10 @@ class ChampionshipPredictor:
         self.trained = False
         self.feature_names = []
         
+        self.updates_since_refit = 0
+        self.last_fit_seconds = 0.0
+        self.fit_history: List[Dict] = []
+        
         self.divisions = {
             'BUF': 'AFC_East', 'MIA': 'AFC_East', 'NE': 'AFC_East', 'NYJ': 'AFC_East',
             'BAL': 'AFC_North', 'CIN': 'AFC_North', 'CLE': 'AFC_North', 'PIT': 'AFC_North',
@@ -125,11 +139,11 @@ class ChampionshipPredictor:
         
         return np.array(features)
     
-    def train(self, games: List[Dict], elo_model, qb_model, epa_model, form_model):
+    def _training_matrix(self, games: List[Dict], elo_model, qb_model, epa_model, form_model):
         X = []
         y = []
         
-        for game in games:
+        for game in GameTable.as_records(games):
             if game.get('Status') != 'Final':
                 continue
             
@@ -138,14 +152,63 @@ class ChampionshipPredictor:
             
             y.append(1 if game['HomeScore'] > game['AwayScore'] else 0)
         
+        return np.array(X), np.array(y)
+    
+    def train(self, games: List[Dict], elo_model, qb_model, epa_model, form_model):
+        X, y = self._training_matrix(games, elo_model, qb_model, epa_model, form_model)
+        
         if len(X) == 0:
             return
         
-        X = np.array(X)
-        y = np.array(y)
-        
+        self.fit_matrix(X, y)
+    
+    def fit_matrix(self, X: np.ndarray, y: np.ndarray):
+        start = time.perf_counter()
+        self.model.set_params(warm_start=False, n_estimators=self.n_estimators, random_state=42, n_jobs=self.n_jobs)
         self.model.fit(X, y)
+        self.model.set_params(n_jobs=1)
         self.trained = True
+        self.updates_since_refit = 0
+        self._record_fit('full', len(y), start)
+    
+    def update(self, games: List[Dict], elo_model, qb_model, epa_model, form_model):
+        if not self.trained or (self.full_refit_every and self.updates_since_refit + 1 >= self.full_refit_every):
+            self.train(games, elo_model, qb_model, epa_model, form_model)
+            return
+        
+        X, y = self._training_matrix(games, elo_model, qb_model, epa_model, form_model)
+        
+        if len(X) == 0:
+            return
+        
+        if not np.array_equal(np.unique(y), self.model.classes_):
+            self.train(games, elo_model, qb_model, epa_model, form_model)
+            return
+        
+        start = time.perf_counter()
+        self.updates_since_refit += 1
+        
+        n_current = len(self.model.estimators_)
+        self.model.set_params(warm_start=True, n_estimators=n_current + self.refresh_trees,
+                              random_state=42 + len(self.fit_history), n_jobs=self.n_jobs)
+        self.model.fit(X, y)
+        
+        excess = len(self.model.estimators_) - self.n_estimators
+        if excess > 0:
+            self.model.estimators_ = self.model.estimators_[excess:]
+        self.model.set_params(warm_start=False, n_estimators=len(self.model.estimators_), n_jobs=1)
+        
+        self._record_fit('incremental', len(y), start)
+    
+    def _record_fit(self, mode: str, n_games: int, start: float):
+        self.last_fit_seconds = time.perf_counter() - start
+        self.fit_history.append({
+            'mode': mode,
+            'games': n_games,
+            'trees': len(self.model.estimators_),
+            'seconds': self.last_fit_seconds
+        })
+        logger.info(f"ChampionshipPredictor {mode} fit on {n_games} games ({len(self.model.estimators_)} trees) in {self.last_fit_seconds * 1000:.1f} ms")
     
     def predict(self, game: Dict, elo_model, qb_model, epa_model, form_model) -> float:
         if not self.trained:
@@ -157,6 +220,11 @@ class ChampionshipPredictor:
         prob = self.model.predict_proba(X)[0][1]
         return prob
     
+    def predict_matrix(self, X: np.ndarray) -> np.ndarray:
+        if not self.trained:
+            return np.full(len(X), 0.5)
+        return self.model.predict_proba(X)[:, 1]
+    
     def get_feature_importance(self) -> Dict[str, float]:
         if not self.trained:
             return {}
@@ -1,5 +1,6 @@
 import math
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Union
+from src.data.games import GameTable
 
 class EloModel:
     def __init__(self, base_rating: float = 1500.0, k_factor: float = 20.0, hfa: float = 65.0):
@@ -14,6 +15,10 @@ class EloModel:
     def set_rating(self, team: str, rating: float):
         self.ratings[team] = rating
 
+    def regress_to_mean(self, fraction: float = 1.0 / 3.0):
+        for team, rating in self.ratings.items():
+            self.ratings[team] = rating + (self.base_rating - rating) * fraction
+
     def get_win_probability(self, team_rating: float, opponent_rating: float, is_home: bool = False) -> float:
         adv = self.hfa if is_home else 0.0
         
@@ -46,29 +51,22 @@ class EloModel:
         self.ratings[team_a] = ra + change
         self.ratings[team_b] = rb - change
 
-    def train(self, games: List[Dict]):
-        for game in games:
-            if game.get('Status') != 'Final':
-                continue
-            
-            home = game['HomeTeam']
-            away = game['AwayTeam']
-            
-            home_score = game.get('HomeScore', 0) or 0
-            away_score = game.get('AwayScore', 0) or 0
-            
+    def train(self, games: Union[List[Dict], GameTable]):
+        rows = GameTable.coerce(games).final_rows('HomeTeam', 'AwayTeam', 'HomeScore', 'AwayScore',
+                                                  'home_turnovers', 'away_turnovers')
+        for home, away, home_score, away_score, h_to, a_to in rows:
             if home_score > away_score:
                 result = "HOME"
             elif away_score > home_score:
                 result = "AWAY"
             else:
                 result = "TIE"
-                
-            h_to = game.get('home_turnovers', 0)
-            a_to = game.get('away_turnovers', 0)
             
             self._update_single_game(home, away, result, h_to, a_to)
 
+    def update(self, games: Union[List[Dict], GameTable]):
+        self.train(games)
+
     def _update_single_game(self, home_team: str, away_team: str, result: str, home_turnovers=0, away_turnovers=0):
         ra = self.ratings.get(home_team, self.base_rating)
         rb = self.ratings.get(away_team, self.base_rating)
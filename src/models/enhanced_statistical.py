@@ -3,19 +3,30 @@ from typing import Dict, List
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import StandardScaler
 from collections import defaultdict
+from src.data.games import GameTable
+
+
+def _int_counter():
+    return defaultdict(int)
+
+
+def _record():
+    return {'wins': 0, 'games': 0}
+
 
 class EnhancedStatisticalModel:
     
-    def __init__(self):
-        self.model = LogisticRegression(C=1.0, max_iter=1000, random_state=42)
+    def __init__(self, C: float = 1.0, max_iter: int = 1000):
+        self.C = C
+        self.model = LogisticRegression(C=C, max_iter=max_iter, random_state=42)
         self.scaler = StandardScaler()
         self.trained = False
         
-        self.h2h_wins = defaultdict(lambda: defaultdict(int))
-        self.h2h_games = defaultdict(lambda: defaultdict(int))
+        self.h2h_wins = defaultdict(_int_counter)
+        self.h2h_games = defaultdict(_int_counter)
         
-        self.home_record = defaultdict(lambda: {'wins': 0, 'games': 0})
-        self.away_record = defaultdict(lambda: {'wins': 0, 'games': 0})
+        self.home_record = defaultdict(_record)
+        self.away_record = defaultdict(_record)
         
         self.recent_opponent_elo = defaultdict(list)
         
@@ -38,7 +49,7 @@ class EnhancedStatisticalModel:
         self.away_record.clear()
         self.recent_opponent_elo.clear()
         
-        for game in games:
+        for game in GameTable.as_records(games):
             if game.get('Status') != 'Final':
                 continue
             
@@ -170,13 +181,11 @@ class EnhancedStatisticalModel:
         
         return np.array(features)
     
-    def train(self, games, elo_model, qb_model, epa_model, form_model):
-        self.update_context(games, elo_model)
-        
+    def _training_matrix(self, games, elo_model, qb_model, epa_model, form_model):
         X = []
         y = []
         
-        for game in games:
+        for game in GameTable.as_records(games):
             if game.get('Status') != 'Final':
                 continue
             
@@ -184,16 +193,27 @@ class EnhancedStatisticalModel:
             X.append(features)
             y.append(1 if game['HomeScore'] > game['AwayScore'] else 0)
         
+        return np.array(X), np.array(y)
+    
+    def train(self, games, elo_model, qb_model, epa_model, form_model):
+        self.update_context(games, elo_model)
+        X, y = self._training_matrix(games, elo_model, qb_model, epa_model, form_model)
+        
         if len(X) == 0:
             return
         
-        X = np.array(X)
-        y = np.array(y)
+        self.fit_matrix(X, y)
+    
+    def fit_matrix(self, X: np.ndarray, y: np.ndarray):
         X_scaled = self.scaler.fit_transform(X)
-        
         self.model.fit(X_scaled, y)
         self.trained = True
     
+    def predict_matrix(self, X: np.ndarray) -> np.ndarray:
+        if not self.trained:
+            return np.full(len(X), 0.5)
+        return self.model.predict_proba(self.scaler.transform(X))[:, 1]
+    
     def predict(self, game, elo_model, qb_model, epa_model, form_model) -> float:
         if not self.trained:
             return 0.5
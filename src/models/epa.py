@@ -1,4 +1,6 @@
-from typing import Dict, List, Any
+import numpy as np
+from typing import Dict, List, Any, Union
+from src.data.games import GameTable
 
 class EPAModel:
     def __init__(self, alpha: float = 0.2):
@@ -8,20 +10,11 @@ class EPAModel:
         self.def_pass_epa: Dict[str, float] = {}
         self.def_rush_epa: Dict[str, float] = {}
 
-    def train(self, games: List[Dict]):
-        sorted_games = sorted(games, key=lambda x: x['Week'])
+    def train(self, games: Union[List[Dict], GameTable]):
+        rows = GameTable.coerce(games).final_rows('HomeTeam', 'AwayTeam', 'home_pass_epa', 'home_rush_epa',
+                                                  'away_pass_epa', 'away_rush_epa', ordered=True)
         
-        for g in sorted_games:
-            if g.get('Status') != 'Final': continue
-            
-            home = g['HomeTeam']
-            away = g['AwayTeam']
-            
-            h_pe = g.get('home_pass_epa', 0)
-            h_re = g.get('home_rush_epa', 0)
-            a_pe = g.get('away_pass_epa', 0)
-            a_re = g.get('away_rush_epa', 0)
-            
+        for home, away, h_pe, h_re, a_pe, a_re in rows:
             self._update(self.off_pass_epa, home, h_pe)
             self._update(self.off_rush_epa, home, h_re)
             self._update(self.def_pass_epa, away, h_pe)
@@ -32,12 +25,34 @@ class EPAModel:
             self._update(self.def_pass_epa, home, a_pe)
             self._update(self.def_rush_epa, home, a_re)
 
+    def update(self, games: Union[List[Dict], GameTable]):
+        self.train(games)
+
+    def train_team_weeks(self, table):
+        weeks, week_idx = np.unique(table['Season'].to_numpy() * 100 + table['Week'].to_numpy(), return_inverse=True)
+        teams, team_idx = np.unique(table['Team'].to_numpy().astype(str), return_inverse=True)
+
+        for ratings, name in ((self.off_pass_epa, 'off_pass'), (self.off_rush_epa, 'off_rush'),
+                              (self.def_pass_epa, 'def_pass'), (self.def_rush_epa, 'def_rush')):
+            grid = np.full((len(weeks), len(teams)), np.nan)
+            grid[week_idx, team_idx] = table[f"{name}_epa"].to_numpy(dtype=float) * table[f"{name}_plays"].to_numpy(dtype=float)
+
+            state = np.array([ratings.get(t, 0.0) for t in teams])
+            played = np.zeros(len(teams), dtype=bool)
+            for row in grid:
+                has = ~np.isnan(row)
+                state[has] = state[has] * (1.0 - self.alpha) + row[has] * self.alpha
+                played |= has
+
+            for team, value in zip(teams[played].tolist(), state[played].tolist()):
+                ratings[team] = value
+
     def _update(self, rating_dict, team, value):
         curr = rating_dict.get(team, 0.0) 
         new_val = (curr * (1.0 - self.alpha)) + (value * self.alpha)
         rating_dict[team] = new_val
 
-    def get_win_probability(self, home_team: str, away_team: str, is_home=True) -> float:
+    def net_epa(self, home_team: str, away_team: str) -> float:
         h_pass_exp = (self.off_pass_epa.get(home_team, 0) + self.def_pass_epa.get(away_team, 0)) / 2
         h_rush_exp = (self.off_rush_epa.get(home_team, 0) + self.def_rush_epa.get(away_team, 0)) / 2
         h_total_epa = h_pass_exp + h_rush_exp
@@ -46,7 +61,10 @@ class EPAModel:
         a_rush_exp = (self.off_rush_epa.get(away_team, 0) + self.def_rush_epa.get(home_team, 0)) / 2
         a_total_epa = a_pass_exp + a_rush_exp
         
-        net_epa = h_total_epa - a_total_epa
+        return h_total_epa - a_total_epa
+
+    def get_win_probability(self, home_team: str, away_team: str, is_home=True) -> float:
+        net_epa = self.net_epa(home_team, away_team)
         
         if is_home:
             net_epa += 2.5 
@@ -1,26 +1,35 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
+from src.data.games import GameTable
 
 class PowerRatingModel:
     def __init__(self):
         self.off_ratings: Dict[str, float] = {}
         self.def_ratings: Dict[str, float] = {}
         self.league_avg_score = 22.0
+        self.scores_for: Dict[str, List[float]] = {}
+        self.scores_allowed: Dict[str, List[float]] = {}
+        self.opponents: Dict[str, List[str]] = {}
+        self.total_score = 0
+        self.score_count = 0
 
-    def train(self, games: List[Dict], iterations: int = 10):
-        scores_for = {}
-        scores_allowed = {}
-        opponents = {}
-        
-        all_scores = []
+    def train(self, games: Union[List[Dict], GameTable], iterations: int = 10):
+        self.scores_for = {}
+        self.scores_allowed = {}
+        self.opponents = {}
+        self.total_score = 0
+        self.score_count = 0
+        self.update(games, iterations)
+
+    def update(self, games: Union[List[Dict], GameTable], iterations: int = 10):
+        scores_for = self.scores_for
+        scores_allowed = self.scores_allowed
+        opponents = self.opponents
         
-        for game in games:
-            if game.get('Status') != 'Final': continue
-            home = game['HomeTeam']
-            away = game['AwayTeam']
-            h_score = game.get('HomeScore', 0)
-            a_score = game.get('AwayScore', 0)
-            
-            all_scores.extend([h_score, a_score])
+        rows = GameTable.coerce(games).final_rows('HomeTeam', 'AwayTeam', 'HomeScore', 'AwayScore')
+        for home, away, h_score, a_score in rows:
+            self.total_score += h_score
+            self.total_score += a_score
+            self.score_count += 2
             
             if home not in scores_for:
                 scores_for[home] = []
@@ -39,8 +48,8 @@ class PowerRatingModel:
             scores_allowed[away].append(h_score)
             opponents[away].append(home)
             
-        if all_scores:
-            self.league_avg_score = sum(all_scores) / len(all_scores)
+        if self.score_count:
+            self.league_avg_score = self.total_score / self.score_count
             
         for team in scores_for:
             avg_pts = sum(scores_for[team])/len(scores_for[team])
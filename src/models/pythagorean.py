@@ -1,22 +1,21 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
+from src.data.games import GameTable
 
 class PythagoreanModel:
     def __init__(self, exponent: float = 2.37):
         self.exponent = exponent
         self.stats: Dict[str, Dict[str, float]] = {}
+        self.totals: Dict[str, Dict[str, float]] = {}
 
-    def train(self, games: List[Dict]):
-        temp_stats = {}
+    def train(self, games: Union[List[Dict], GameTable]):
+        self.totals = {}
+        self.update(games)
+
+    def update(self, games: Union[List[Dict], GameTable]):
+        temp_stats = self.totals
         
-        for game in games:
-            if game.get('Status') != 'Final':
-                continue
-                
-            home = game['HomeTeam']
-            away = game['AwayTeam']
-            h_score = game.get('HomeScore', 0)
-            a_score = game.get('AwayScore', 0)
-            
+        rows = GameTable.coerce(games).final_rows('HomeTeam', 'AwayTeam', 'HomeScore', 'AwayScore')
+        for home, away, h_score, a_score in rows:
             if home not in temp_stats: temp_stats[home] = {'PF': 0, 'PA': 0}
             if away not in temp_stats: temp_stats[away] = {'PF': 0, 'PA': 0}
             
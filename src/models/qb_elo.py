@@ -1,4 +1,5 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
+from src.data.games import GameTable
 
 class QBEloModel:
     def __init__(self, base_rating: float = 1400.0, k_factor: float = 20.0):
@@ -11,20 +12,16 @@ class QBEloModel:
             return self.base_rating
         return self.ratings.get(qb_name, self.base_rating)
 
-    def train(self, games: List[Dict]):
-        sorted_games = sorted(games, key=lambda x: (x['Season'], x['Week']))
+    def regress_to_mean(self, fraction: float = 1.0 / 3.0):
+        for qb, rating in self.ratings.items():
+            self.ratings[qb] = rating + (self.base_rating - rating) * fraction
+
+    def train(self, games: Union[List[Dict], GameTable]):
+        rows = GameTable.coerce(games).final_rows('home_qb_name', 'away_qb_name', 'HomeScore', 'AwayScore', ordered=True)
         
-        for game in sorted_games:
-            if game.get('Status') != 'Final': continue
-            
-            home_qb = game.get('home_qb_name')
-            away_qb = game.get('away_qb_name')
-            
+        for home_qb, away_qb, h_score, a_score in rows:
             if not home_qb or not away_qb:
                 continue
-                
-            h_score = game.get('HomeScore', 0)
-            a_score = game.get('AwayScore', 0)
             
             winner_qb = None
             if h_score > a_score:
@@ -51,6 +48,9 @@ class QBEloModel:
             self.ratings[home_qb] = ra + change
             self.ratings[away_qb] = rb - change
 
+    def update(self, games: Union[List[Dict], GameTable]):
+        self.train(games)
+
     def get_win_probability(self, home_qb: str, away_qb: str, is_home: bool = False) -> float:
         ra = self.get_rating(home_qb)
         rb = self.get_rating(away_qb)
@@ -1,25 +1,22 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
+from src.data.games import GameTable
 
 class RecentFormModel:
     def __init__(self, window: int = 5):
         self.window = window
         self.ratings: Dict[str, float] = {}
+        self.team_games: Dict[str, List[float]] = {}
 
-    def train(self, games: List[Dict]):
-        team_games = {}
+    def train(self, games: Union[List[Dict], GameTable]):
+        self.team_games = {}
+        self.update(games)
+
+    def update(self, games: Union[List[Dict], GameTable]):
+        team_games = self.team_games
         
-        sorted_games = sorted(games, key=lambda x: (x['Season'], x['Week']))
+        rows = GameTable.coerce(games).final_rows('HomeTeam', 'AwayTeam', 'HomeScore', 'AwayScore', ordered=True)
         
-        for game in sorted_games:
-            if game.get('Status') != 'Final': continue
-            
-            home = game['HomeTeam']
-            away = game['AwayTeam']
-            h_score = game.get('HomeScore', 0)
-            a_score = game.get('AwayScore', 0)
-            if h_score is None: h_score = 0
-            if a_score is None: a_score = 0
-            
+        for home, away, h_score, a_score in rows:
             margin = h_score - a_score
             
             if home not in team_games: team_games[home] = []
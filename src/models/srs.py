@@ -1,21 +1,23 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
+from src.data.games import GameTable
 
 class SRSModel:
     def __init__(self):
         self.ratings: Dict[str, float] = {}
+        self.margins: Dict[str, List[float]] = {}
+        self.opponents: Dict[str, List[str]] = {}
 
-    def train(self, games: List[Dict], iterations: int = 10):
-        margins = {}
-        opponents = {}
+    def train(self, games: Union[List[Dict], GameTable], iterations: int = 10):
+        self.margins = {}
+        self.opponents = {}
+        self.update(games, iterations)
+
+    def update(self, games: Union[List[Dict], GameTable], iterations: int = 10):
+        margins = self.margins
+        opponents = self.opponents
         
-        for game in games:
-            if game.get('Status') != 'Final': 
-                continue
-                
-            home = game['HomeTeam']
-            away = game['AwayTeam']
-            h_score = game.get('HomeScore', 0)
-            a_score = game.get('AwayScore', 0)
+        rows = GameTable.coerce(games).final_rows('HomeTeam', 'AwayTeam', 'HomeScore', 'AwayScore')
+        for home, away, h_score, a_score in rows:
             margin = h_score - a_score
             
             if home not in margins: 
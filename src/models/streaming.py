@@ -0,0 +1,71 @@
+import time
+import logging
+from typing import Dict, List, Iterable, Tuple
+from src.data.games import GameTable
+
+logger = logging.getLogger(__name__)
+
+FIRST_NFLVERSE_SEASON = 1999
+
+
+class StreamingTrainer:
+    def __init__(self, models: Dict[str, object], regression: float = 1.0 / 3.0):
+        self.models = models
+        self.regression = regression
+        self.seasons: List[int] = []
+        self.games = 0
+        self.seconds = 0.0
+
+    def train_season(self, season: int, games: List[Dict]):
+        if self.seasons and season <= self.seasons[-1]:
+            raise ValueError(f"Season {season} arrived after {self.seasons[-1]}; chunks must be in order")
+
+        start = time.perf_counter()
+        table = GameTable.from_records(games)
+        completed = table[table.final]
+
+        for model in self.models.values():
+            if self.seasons and hasattr(model, 'regress_to_mean'):
+                model.regress_to_mean(self.regression)
+            model.train(completed)
+
+        elapsed = time.perf_counter() - start
+        self.seasons.append(season)
+        self.games += len(completed)
+        self.seconds += elapsed
+        logger.debug(f"Trained {season}: {len(completed)} games in {elapsed * 1000:.1f} ms")
+
+    def train_stream(self, chunks: Iterable[Tuple[int, List[Dict]]]) -> Dict:
+        for season, games in chunks:
+            self.train_season(season, games)
+        return self.summary()
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.seconds if self.seconds > 0 else 0.0
+
+    def summary(self) -> Dict:
+        return {
+            'seasons': len(self.seasons),
+            'first_season': self.seasons[0] if self.seasons else None,
+            'last_season': self.seasons[-1] if self.seasons else None,
+            'games': self.games,
+            'seconds': self.seconds,
+            'games_per_second': self.games_per_second,
+        }
+
+
+def train_history(client, end_season: int, start_season: int = FIRST_NFLVERSE_SEASON,
+                  regression: float = 1.0 / 3.0, force_refresh: bool = False) -> Tuple[Dict, Dict]:
+    from src.models.elo import EloModel
+    from src.models.qb_elo import QBEloModel
+
+    trainer = StreamingTrainer({
+        'elo': EloModel(k_factor=50, hfa=40),
+        'qb': QBEloModel(),
+    }, regression=regression)
+
+    summary = trainer.train_stream(client.iter_schedules(range(start_season, end_season + 1), force_refresh=force_refresh))
+    logger.info(f"Trained {summary['games']} games over {summary['seasons']} seasons "
+                f"({summary['games_per_second']:,.0f} games/s)")
+    return trainer.models, summary
@@ -181,11 +181,18 @@ class SuperBowl2025Predictor:
         else:
             return self.simulate_game(div_winner_2, div_winner_1)
     
-    def simulate_super_bowl(self, n_simulations: int = 10000) -> Dict[str, float]:
+    def simulate_super_bowl(self, n_simulations: int = 10000, bootstrap=None) -> Dict[str, float]:
         all_teams = list(self.afc_teams.values()) + list(self.nfc_teams.values())
         results = {team: 0 for team in all_teams}
+        point_models = (self.elo_model, self.srs_model, self.power_model)
         
         for i in range(n_simulations):
+            if bootstrap is not None:
+                replicate = bootstrap.sample()
+                self.elo_model = replicate['elo']
+                self.srs_model = replicate['srs']
+                self.power_model = replicate['power']
+            
             afc_champ = self.simulate_conference_playoffs(self.afc_teams)
             nfc_champ = self.simulate_conference_playoffs(self.nfc_teams)
             sb_winner = self.simulate_game(afc_champ, nfc_champ, neutral=True)
@@ -196,10 +203,11 @@ class SuperBowl2025Predictor:
                 sys.stdout.write(f"\rSimulating: [{int(progress/2) * '=':<50}] {progress:.1f}%")
                 sys.stdout.flush()
         
+        self.elo_model, self.srs_model, self.power_model = point_models
         sys.stdout.write("\n")
         return {team: count / n_simulations for team, count in results.items()}
     
-    def predict(self, games, n_simulations: int = 50000):
+    def predict(self, games, n_simulations: int = 50000, bootstrap=None):
         wins = self.determine_playoff_teams(games)
         
         print("\n" + "="*70)
@@ -224,7 +232,7 @@ class SuperBowl2025Predictor:
         print(f"Running {n_simulations:,} playoff simulations...")
         print("-"*70 + "\n")
         
-        probs = self.simulate_super_bowl(n_simulations)
+        probs = self.simulate_super_bowl(n_simulations, bootstrap=bootstrap)
         sorted_probs = sorted(probs.items(), key=lambda x: -x[1])
         
         print("SUPER BOWL WIN PROBABILITY:\n")
@@ -261,40 +269,20 @@ def get_primary_qbs(games):
 
 def predict_super_bowl_2025():
     from src.data.client import NFLVerseClient
-    from src.models.elo import EloModel
-    from src.models.epa import EPAModel
+    from src.models.training import TrainingGraph, ensemble_tasks, model_cache
     
     client = NFLVerseClient()
     schedule_2025 = client.get_schedules(2025)
     completed = [g for g in schedule_2025 if g['Status'] == 'Final']
     
     print("Training models...")
-    elo = EloModel(k_factor=50, hfa=40)
-    elo.train(completed)
-    
-    epa = EPAModel()
-    epa.train(completed)
-    
-    srs = SRSModel()
-    srs.train(completed)
-    
-    power = PowerRatingModel()
-    power.train(completed)
-    
-    pyth = PythagoreanModel()
-    pyth.train(completed)
-    
-    form = RecentFormModel()
-    form.train(completed)
-    
-    qb = QBEloModel()
-    qb.train(completed)
-    
-    enhanced = EnhancedStatisticalModel()
-    enhanced.train(completed, elo, qb, epa, form)
+    graph = TrainingGraph(ensemble_tasks(), cache=model_cache())
+    trained = graph.run(completed)
+    graph.print_timings()
     
-    champ = ChampionshipPredictor()
-    champ.train(completed, elo, qb, epa, form)
+    elo, epa, srs = trained['elo'], trained['epa'], trained['srs']
+    power, pyth, form = trained['power'], trained['pyth'], trained['form']
+    qb, enhanced, champ = trained['qb'], trained['enhanced'], trained['champ']
     
     primary_qbs = get_primary_qbs(completed)
     
@@ -0,0 +1,189 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Tuple, Any, Optional, Sequence
+from src.data.cache import DiskCache, fingerprint, code_version
+
+logger = logging.getLogger(__name__)
+
+
+class TrainingTask:
+
+    def __init__(self, name: str, model_cls, kwargs: Optional[Dict] = None, depends_on: Sequence[str] = ()):
+        self.name = name
+        self.model_cls = model_cls
+        self.kwargs = kwargs or {}
+        self.depends_on = tuple(depends_on)
+
+
+def model_cache() -> DiskCache:
+    return DiskCache('models')
+
+
+def _run_task(task: TrainingTask, games: List[Dict], dependencies: List[Any]) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    model = task.model_cls(**task.kwargs)
+    model.train(games, *dependencies)
+    return model, time.perf_counter() - start
+
+
+class TrainingGraph:
+
+    def __init__(self, tasks: List[TrainingTask], executor: str = 'thread', max_workers: Optional[int] = None,
+                 cache: Optional[DiskCache] = None):
+        if executor not in ('process', 'thread', 'serial'):
+            raise ValueError(f"Unknown executor: {executor}")
+
+        names = [t.name for t in tasks]
+        if len(set(names)) != len(names):
+            raise ValueError("Duplicate task names in training graph")
+        for t in tasks:
+            missing = [d for d in t.depends_on if d not in names]
+            if missing:
+                raise ValueError(f"Task '{t.name}' depends on unknown task(s): {missing}")
+
+        self.tasks = {t.name: t for t in tasks}
+        self.executor = executor
+        self.max_workers = max_workers
+        self.cache = cache
+        self.timings: Dict[str, float] = {}
+        self.cached: set = set()
+        self.wall_time = 0.0
+
+    def _cache_keys(self, games: List[Dict]) -> Dict[str, str]:
+        games_key = fingerprint(games)
+        keys = {}
+        remaining = list(self.tasks.values())
+        while remaining:
+            ready = [t for t in remaining if all(d in keys for d in t.depends_on)]
+            if not ready:
+                raise ValueError(f"Training graph contains a dependency cycle: {sorted(t.name for t in remaining)}")
+            for task in ready:
+                keys[task.name] = fingerprint(
+                    games_key,
+                    f"{task.model_cls.__module__}.{task.model_cls.__qualname__}",
+                    code_version(task.model_cls),
+                    task.kwargs,
+                    [keys[d] for d in task.depends_on],
+                )
+                remaining.remove(task)
+        return keys
+
+    def _load_cached(self, games: List[Dict]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        if self.cache is None:
+            return {}, {}
+
+        keys = self._cache_keys(games)
+        trained = {}
+        for name in self.tasks:
+            start = time.perf_counter()
+            model = self.cache.get(keys[name])
+            if model is not None:
+                trained[name] = model
+                self.cached.add(name)
+                self.timings[name] = time.perf_counter() - start
+                logger.info(f"Loaded {name} from cache in {self.timings[name] * 1000:.1f} ms")
+        return trained, keys
+
+    def run(self, games: List[Dict]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        self.timings = {}
+        self.cached = set()
+
+        trained, keys = self._load_cached(games)
+
+        if len(trained) < len(self.tasks):
+            if self.executor == 'serial':
+                self._run_serial(games, trained)
+            else:
+                pool_cls = ProcessPoolExecutor if self.executor == 'process' else ThreadPoolExecutor
+                with pool_cls(max_workers=self.max_workers) as pool:
+                    self._run_pool(pool, games, trained)
+
+        if self.cache is not None:
+            for name, model in trained.items():
+                if name not in self.cached:
+                    self.cache.put(keys[name], model)
+
+        self.wall_time = time.perf_counter() - start
+        return trained
+
+    def _ready(self, trained: Dict, submitted: set) -> List[TrainingTask]:
+        return [t for name, t in self.tasks.items()
+                if name not in submitted and all(d in trained for d in t.depends_on)]
+
+    def _run_serial(self, games: List[Dict], trained: Dict[str, Any]) -> Dict[str, Any]:
+        while len(trained) < len(self.tasks):
+            ready = self._ready(trained, set(trained))
+            if not ready:
+                raise ValueError("Training graph contains a dependency cycle")
+            for task in ready:
+                model, elapsed = _run_task(task, games, [trained[d] for d in task.depends_on])
+                self._record(task.name, elapsed)
+                trained[task.name] = model
+        return trained
+
+    def _run_pool(self, pool, games: List[Dict], trained: Dict[str, Any]) -> Dict[str, Any]:
+        submitted = set(trained)
+        pending = {}
+
+        while len(trained) < len(self.tasks):
+            for task in self._ready(trained, submitted):
+                deps = [trained[d] for d in task.depends_on]
+                pending[pool.submit(_run_task, task, games, deps)] = task.name
+                submitted.add(task.name)
+
+            if not pending:
+                raise ValueError("Training graph contains a dependency cycle")
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                model, elapsed = future.result()
+                self._record(name, elapsed)
+                trained[name] = model
+
+        return trained
+
+    def _record(self, name: str, elapsed: float):
+        self.timings[name] = elapsed
+        logger.info(f"Trained {name} in {elapsed * 1000:.1f} ms")
+
+    def print_timings(self):
+        print(f"{'Model':<12} | {'Train Time':>12}")
+        print("-" * 27)
+        for name, elapsed in sorted(self.timings.items(), key=lambda x: -x[1]):
+            source = " (cached)" if name in self.cached else ""
+            print(f"{name:<12} | {elapsed * 1000:>9.1f} ms{source}")
+        print("-" * 27)
+        print(f"{'Wall':<12} | {self.wall_time * 1000:>9.1f} ms")
+
+
+def ensemble_tasks(include_sklearn: bool = True) -> List[TrainingTask]:
+    from src.models.elo import EloModel
+    from src.models.epa import EPAModel
+    from src.models.srs import SRSModel
+    from src.models.power import PowerRatingModel
+    from src.models.pythagorean import PythagoreanModel
+    from src.models.recent_form import RecentFormModel
+    from src.models.qb_elo import QBEloModel
+
+    tasks = [
+        TrainingTask('elo', EloModel, {'k_factor': 50, 'hfa': 40}),
+        TrainingTask('epa', EPAModel),
+        TrainingTask('srs', SRSModel),
+        TrainingTask('power', PowerRatingModel),
+        TrainingTask('pyth', PythagoreanModel),
+        TrainingTask('form', RecentFormModel),
+        TrainingTask('qb', QBEloModel),
+    ]
+
+    if include_sklearn:
+        from src.models.enhanced_statistical import EnhancedStatisticalModel
+        from src.models.championship import ChampionshipPredictor
+
+        feature_deps = ('elo', 'qb', 'epa', 'form')
+        tasks.append(TrainingTask('enhanced', EnhancedStatisticalModel, depends_on=feature_deps))
+        tasks.append(TrainingTask('champ', ChampionshipPredictor, depends_on=feature_deps))
+
+    return tasks
@@ -0,0 +1,271 @@
+import time
+import logging
+import itertools
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from typing import Dict, List, Tuple, Optional
+from src.models.elo import EloModel
+from src.models.qb_elo import QBEloModel
+from src.models.epa import EPAModel
+from src.models.recent_form import RecentFormModel
+from src.models.enhanced_statistical import EnhancedStatisticalModel
+from src.models.championship import ChampionshipPredictor
+from src.models.streaming import StreamingTrainer
+from src.data import shared
+from src.data.games import GameTable
+
+logger = logging.getLogger(__name__)
+
+EPS = 1e-15
+
+ESTIMATORS = {
+    'enhanced': EnhancedStatisticalModel,
+    'champ': ChampionshipPredictor,
+}
+
+DEFAULT_GRIDS = {
+    'enhanced': {'C': [0.1, 1.0, 10.0]},
+    'champ': {'n_estimators': [100, 300], 'max_depth': [6, 12]},
+}
+
+
+POSTGAME_FIELDS = ('home_rush_epa', 'home_pass_epa', 'away_rush_epa', 'away_pass_epa',
+                   'home_rush_yards', 'home_pass_yards', 'away_rush_yards', 'away_pass_yards',
+                   'home_turnovers', 'away_turnovers')
+
+
+def _pregame(game: Dict) -> Dict:
+    return {k: v for k, v in game.items() if k not in POSTGAME_FIELDS}
+
+
+def param_grid(grid: Dict[str, List]) -> List[Dict]:
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+class FeatureMatrices:
+    def __init__(self, games: List[Dict], regression: float = 1.0 / 3.0):
+        start = time.perf_counter()
+        final = sorted((g for g in games if g.get('Status') == 'Final'), key=lambda g: (g['Season'], g['Week']))
+
+        self.season = np.array([g['Season'] for g in final], dtype=np.int64)
+        self.week = np.array([g['Week'] for g in final], dtype=np.int64)
+        self.y = np.array([1 if g['HomeScore'] > g['AwayScore'] else 0 for g in final], dtype=np.int64)
+        self.fit: Dict[str, np.ndarray] = {}
+        self.predict: Dict[str, np.ndarray] = {}
+
+        elo = EloModel(k_factor=50, hfa=40)
+        qb = QBEloModel()
+        epa = EPAModel()
+        form = RecentFormModel()
+        enhanced = EnhancedStatisticalModel()
+        champ = ChampionshipPredictor()
+
+        table = GameTable.from_records(final)
+        rows = {name: ([], []) for name in ESTIMATORS}
+        seen: List[Dict] = []
+        cursor = 0
+        while cursor < len(final):
+            season, week = final[cursor]['Season'], final[cursor]['Week']
+            end = cursor
+            while end < len(final) and (final[end]['Season'], final[end]['Week']) == (season, week):
+                end += 1
+            week_games = final[cursor:end]
+
+            enhanced.update_context(seen, elo)
+            for g in week_games:
+                pregame = _pregame(g)
+                for name, extractor in (('enhanced', enhanced), ('champ', champ)):
+                    rows[name][0].append(extractor.extract_features(g, elo, qb, epa, form, for_prediction=False))
+                    rows[name][1].append(extractor.extract_features(pregame, elo, qb, epa, form, for_prediction=True))
+
+            for model in (elo, qb, epa, form):
+                model.update(table[cursor:end])
+            if end < len(final) and final[end]['Season'] != season:
+                for model in (elo, qb):
+                    model.regress_to_mean(regression)
+            seen.extend(week_games)
+            cursor = end
+
+        for name, (fit_rows, predict_rows) in rows.items():
+            self.fit[name] = np.array(fit_rows, dtype=float)
+            self.predict[name] = np.array(predict_rows, dtype=float)
+
+        self.seconds = time.perf_counter() - start
+        logger.info(f"Built feature matrices for {len(final)} games in {self.seconds * 1000:.1f} ms")
+
+    def __len__(self) -> int:
+        return len(self.y)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        columns = {'y': self.y}
+        for name in self.fit:
+            columns[f"fit:{name}"] = self.fit[name]
+            columns[f"predict:{name}"] = self.predict[name]
+        return columns
+
+    def units(self, fold: str) -> np.ndarray:
+        if fold == 'season':
+            return self.season
+        if fold == 'week':
+            return self.season * 100 + self.week
+        raise ValueError(f"Unknown fold unit: {fold}")
+
+
+def season_start_drift(games: List[Dict], matrices: Optional[FeatureMatrices] = None,
+                       regression: float = 1.0 / 3.0) -> Dict[int, float]:
+    matrices = matrices or FeatureMatrices(games, regression)
+    final = sorted((g for g in games if g.get('Status') == 'Final'), key=lambda g: (g['Season'], g['Week']))
+
+    drift = {}
+    for season in np.unique(matrices.season)[1:].tolist():
+        prior = [g for g in final if g['Season'] < season]
+        trainer = StreamingTrainer({
+            'elo': EloModel(k_factor=50, hfa=40),
+            'qb': QBEloModel(),
+            'epa': EPAModel(),
+            'form': RecentFormModel(),
+        }, regression=regression)
+        trainer.train_stream((s, list(chunk)) for s, chunk in itertools.groupby(prior, key=lambda g: g['Season']))
+        models = trainer.models
+        for name in ('elo', 'qb'):
+            models[name].regress_to_mean(regression)
+
+        enhanced = EnhancedStatisticalModel()
+        enhanced.update_context(prior, models['elo'])
+        in_season = matrices.season == season
+        rows = np.flatnonzero(in_season & (matrices.week == matrices.week[in_season].min()))
+        diffs = []
+        for name, extractor in (('enhanced', enhanced), ('champ', ChampionshipPredictor())):
+            expected = np.array([extractor.extract_features(_pregame(final[i]), models['elo'], models['qb'], models['epa'],
+                                                            models['form'], for_prediction=True) for i in rows], dtype=float)
+            diffs.append(np.abs(expected - matrices.predict[name][rows]).max())
+        drift[season] = float(max(diffs))
+    return drift
+
+
+def rolling_origin_folds(units: np.ndarray, min_train: int = 4, window: Optional[int] = None) -> List[Tuple[int, np.ndarray, np.ndarray]]:
+    ordered = np.unique(units)
+    folds = []
+    for i in range(min_train, len(ordered)):
+        lo = ordered[max(0, i - window)] if window else ordered[0]
+        train_idx = np.flatnonzero((units >= lo) & (units < ordered[i]))
+        test_idx = np.flatnonzero(units == ordered[i])
+        folds.append((int(ordered[i]), train_idx, test_idx))
+    return folds
+
+
+_fold_data: Dict = {}
+
+
+def _init_worker(source):
+    _fold_data.clear()
+    _fold_data.update(source.columns() if isinstance(source, FeatureMatrices) else shared.attach(source))
+
+
+def _run_fold(model_name: str, params: Dict, origin: int, train_idx: np.ndarray, test_idx: np.ndarray) -> Dict:
+    y_train = _fold_data['y'][train_idx]
+    y_test = _fold_data['y'][test_idx]
+
+    kwargs = dict(params)
+    if model_name == 'champ':
+        kwargs.setdefault('n_jobs', 1)
+    model = ESTIMATORS[model_name](**kwargs)
+
+    start = time.perf_counter()
+    model.fit_matrix(_fold_data[f"fit:{model_name}"][train_idx], y_train)
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    prob = model.predict_matrix(_fold_data[f"predict:{model_name}"][test_idx])
+    predict_seconds = time.perf_counter() - start
+
+    clipped = np.clip(prob, EPS, 1 - EPS)
+    return {
+        'Model': model_name,
+        'Params': ', '.join(f"{k}={v}" for k, v in sorted(params.items())),
+        'Origin': origin,
+        'train_games': len(train_idx),
+        'test_games': len(test_idx),
+        'accuracy': float(np.mean((prob > 0.5) == (y_test == 1))),
+        'brier': float(np.mean((prob - y_test) ** 2)),
+        'log_loss': float(-np.mean(y_test * np.log(clipped) + (1 - y_test) * np.log(1 - clipped))),
+        'fit_seconds': fit_seconds,
+        'predict_seconds': predict_seconds,
+    }
+
+
+class TimeSeriesCV:
+    def __init__(self, games: List[Dict], fold: str = 'week', min_train: Optional[int] = None,
+                 window: Optional[int] = None, executor: str = 'process', max_workers: Optional[int] = None):
+        if executor not in ('process', 'thread', 'serial'):
+            raise ValueError(f"Unknown executor: {executor}")
+
+        self.matrices = FeatureMatrices(games)
+        self.fold = fold
+        self.units = self.matrices.units(fold)
+        self.min_train = min_train if min_train is not None else (1 if fold == 'season' else 4)
+        self.window = window
+        self.executor = executor
+        self.max_workers = max_workers
+        self.wall_time = 0.0
+
+    def folds(self) -> List[Tuple[int, np.ndarray, np.ndarray]]:
+        folds = rolling_origin_folds(self.units, self.min_train, self.window)
+        usable = [f for f in folds if len(np.unique(self.matrices.y[f[1]])) == 2]
+        if len(usable) < len(folds):
+            logger.warning(f"Skipped {len(folds) - len(usable)} fold(s) with a single outcome class in training")
+        return usable
+
+    def run(self, grids: Optional[Dict[str, Dict[str, List]]] = None) -> pd.DataFrame:
+        grids = grids if grids is not None else DEFAULT_GRIDS
+        unknown = [name for name in grids if name not in ESTIMATORS]
+        if unknown:
+            raise ValueError(f"Unknown model(s) for cross-validation: {unknown}")
+
+        start = time.perf_counter()
+        folds = self.folds()
+        jobs = [(name, params, origin, train_idx, test_idx)
+                for name, grid in grids.items()
+                for params in param_grid(grid)
+                for origin, train_idx, test_idx in folds]
+        logger.info(f"Cross-validating {len(jobs)} fold fits ({self.fold} folds, {self.executor})")
+
+        if self.executor == 'serial':
+            _init_worker(self.matrices)
+            rows = [_run_fold(*job) for job in jobs]
+        else:
+            with shared.SharedTables() as tables:
+                if self.executor == 'process':
+                    handle = tables.publish('cv_matrices', self.matrices.columns())
+                    pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker, initargs=(handle,))
+                else:
+                    _init_worker(self.matrices)
+                    pool = ThreadPoolExecutor(max_workers=self.max_workers)
+                rows = []
+                with pool:
+                    futures = {pool.submit(_run_fold, *job): job[:3] for job in jobs}
+                    for future in as_completed(futures):
+                        name, params, origin = futures[future]
+                        try:
+                            rows.append(future.result())
+                        except Exception as e:
+                            logger.error(f"Fold {name} {params} @ {origin} failed: {e}")
+
+        self.wall_time = time.perf_counter() - start
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame(rows).sort_values(['Model', 'Params', 'Origin']).reset_index(drop=True)
+
+
+def cv_summary(folds: pd.DataFrame) -> pd.DataFrame:
+    out = folds.groupby(['Model', 'Params']).agg(
+        folds=('Origin', 'size'),
+        test_games=('test_games', 'sum'),
+        accuracy=('accuracy', 'mean'),
+        brier=('brier', 'mean'),
+        log_loss=('log_loss', 'mean'),
+        fit_seconds=('fit_seconds', 'sum'),
+    ).reset_index()
+    return out.sort_values(['Model', 'log_loss']).reset_index(drop=True)
@@ -0,0 +1,381 @@
+import os
+import time
+import logging
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Callable, Optional, Iterable
+from src.models.elo import EloModel
+from src.models.pythagorean import PythagoreanModel
+from src.models.srs import SRSModel
+from src.models.recent_form import RecentFormModel
+from src.models.power import PowerRatingModel
+from src.models.qb_elo import QBEloModel
+from src.models.epa import EPAModel
+from src.simulation.metrics import prediction_table
+from src.data.cache import DiskCache, fingerprint, source_version
+from src.data import shared
+from src.data.games import GameTable
+
+logger = logging.getLogger(__name__)
+
+
+MODEL_CLASSES = {
+    'elo': EloModel,
+    'pyth': PythagoreanModel,
+    'srs': SRSModel,
+    'form': RecentFormModel,
+    'power': PowerRatingModel,
+    'qb': QBEloModel,
+    'epa': EPAModel,
+}
+
+
+def _model_class(name: str):
+    if name == 'hfa':
+        from src.models.hfa import DynamicHFAModel
+        return DynamicHFAModel
+    return MODEL_CLASSES[name]
+
+
+class ModelConfig:
+    def __init__(self, name: str, models: Dict[str, Dict]):
+        self.name = name
+        self.models = models
+
+    def __call__(self) -> Dict[str, object]:
+        return {m: _model_class(m)(**kwargs) for m, kwargs in self.models.items()}
+
+
+def config_predictor(models: Dict[str, object]):
+    from src.models.predictor import GamePredictor
+    from src.utils.upsets import UpsetDetector
+
+    return GamePredictor(
+        elo_model=models.get('elo'),
+        pyth_model=models.get('pyth'),
+        srs_model=models.get('srs'),
+        form_model=models.get('form'),
+        power_model=models.get('power'),
+        qb_model=models.get('qb'),
+        hfa_model=models.get('hfa'),
+        epa_model=models.get('epa'),
+        upset_detector=UpsetDetector()
+    )
+
+
+BACKTEST_CONFIGS = {
+    'ensemble': ModelConfig('ensemble', {
+        'elo': {'k_factor': 50, 'hfa': 40}, 'pyth': {}, 'srs': {}, 'form': {},
+        'power': {}, 'qb': {}, 'hfa': {}, 'epa': {},
+    }),
+    'ratings': ModelConfig('ratings', {
+        'elo': {'k_factor': 50, 'hfa': 40}, 'srs': {}, 'power': {}, 'pyth': {},
+    }),
+    'elo': ModelConfig('elo', {'elo': {'k_factor': 50, 'hfa': 40}}),
+    'elo_k20': ModelConfig('elo_k20', {'elo': {'k_factor': 20, 'hfa': 65}}),
+}
+
+
+def default_models() -> Dict[str, object]:
+    from src.models.hfa import DynamicHFAModel
+
+    return {
+        'elo': EloModel(k_factor=50, hfa=40),
+        'pyth': PythagoreanModel(),
+        'srs': SRSModel(),
+        'form': RecentFormModel(),
+        'power': PowerRatingModel(),
+        'qb': QBEloModel(),
+        'hfa': DynamicHFAModel(),
+        'epa': EPAModel(),
+    }
+
+
+def default_predictor(models: Dict[str, object]):
+    from src.models.predictor import GamePredictor
+    from src.utils.upsets import UpsetDetector
+
+    return GamePredictor(models['elo'], models['pyth'], models['srs'], models['form'], models['power'],
+                         models['qb'], models['hfa'], epa_model=models['epa'], upset_detector=UpsetDetector())
+
+
+class WalkForwardBacktest:
+    def __init__(self, schedule: List[Dict], season: int,
+                 model_factory: Callable[[], Dict[str, object]] = default_models,
+                 predictor_factory: Callable[[Dict[str, object]], object] = default_predictor,
+                 verbose: bool = True):
+        self.schedule = schedule
+        self.verbose = verbose
+        self.season = season
+        self.model_factory = model_factory
+        self.predictor_factory = predictor_factory
+
+        final = [g for g in schedule if g['Status'] == 'Final']
+        self.final_games = sorted(final, key=lambda g: g['Week'])
+        self.table = GameTable.from_records(self.final_games)
+        self.weeks = sorted(set(g['Week'] for g in final if g['Season'] == season))
+
+    def _plan(self, weeks: List[int]) -> List[Dict]:
+        plan = []
+        cursor = 0
+        for week in weeks:
+            new_games = []
+            while cursor < len(self.final_games) and self.final_games[cursor]['Week'] < week:
+                new_games.append(self.final_games[cursor])
+                cursor += 1
+            week_games = [g for g in self.final_games[cursor:] if g['Week'] == week]
+            plan.append({'week': week, 'new_games': new_games, 'week_games': week_games, 'seen': cursor})
+        return plan
+
+    def config_key(self) -> str:
+        models = self.model_factory()
+        predictor = self.predictor_factory(models)
+        return fingerprint(
+            getattr(self.model_factory, 'models', None),
+            sorted((name, type(m).__qualname__) for name, m in models.items()),
+            type(predictor).__qualname__,
+            source_version(),
+        )
+
+    def run(self, weeks: Optional[List[int]] = None, cache: Optional[DiskCache] = None) -> List[Dict]:
+        plan = self._plan(weeks if weeks is not None else self.weeks)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        cached = {}
+        if cache is not None:
+            train_key = self.config_key()
+            for step in plan:
+                train_key = fingerprint(train_key, step['new_games'])
+                step['key'] = fingerprint(train_key, step['week_games'])
+                hit = cache.get(step['key'])
+                if hit is not None:
+                    cached[step['week']] = hit
+            self.cache_hits = len(cached)
+            self.cache_misses = len(plan) - len(cached)
+            logger.info(f"Backtest week cache: {self.cache_hits}/{len(plan)} hits")
+
+        last_miss = max((i for i, step in enumerate(plan) if step['week'] not in cached), default=-1)
+
+        models = self.model_factory()
+        trained = 0
+
+        for step in plan[:last_miss + 1]:
+            self._advance(models, self.table[trained:step['seen']], self.table[:step['seen']])
+            trained = step['seen']
+
+            week = step['week']
+            if week in cached:
+                continue
+            if self.verbose:
+                print(f"Testing Week {week}...", end='\r')
+
+            predictor = self.predictor_factory(models)
+            cached[week] = self.predict_games(predictor, step['week_games'], models)
+            if cache is not None:
+                cache.put(step['key'], cached[week])
+
+        return [r for step in plan for r in cached[step['week']]]
+
+    def _advance(self, models: Dict[str, object], new_games: GameTable, seen: GameTable):
+        stale = []
+        for name, model in models.items():
+            if hasattr(model, 'update'):
+                if new_games:
+                    model.update(new_games)
+            else:
+                stale.append(name)
+
+        if stale:
+            fresh = self.model_factory()
+            for name in stale:
+                fresh[name].train(seen.to_records())
+                models[name] = fresh[name]
+
+    @staticmethod
+    def model_diffs(models: Dict[str, object], g: Dict) -> Dict:
+        elo = models.get('elo')
+        qb = models.get('qb')
+        epa = models.get('epa')
+        home = g['HomeTeam']
+        away = g['AwayTeam']
+        return {
+            'Elo_Diff': elo.get_rating(home) - elo.get_rating(away) if elo else np.nan,
+            'QB_Diff': qb.get_rating(g.get('home_qb_name')) - qb.get_rating(g.get('away_qb_name')) if qb else np.nan,
+            'EPA_Diff': epa.net_epa(home, away) if epa else np.nan,
+        }
+
+    @staticmethod
+    def predict_games(predictor, games: List[Dict], models: Optional[Dict[str, object]] = None) -> List[Dict]:
+        records = []
+        for g in games:
+            home = g['HomeTeam']
+            away = g['AwayTeam']
+            actual_home_score = g['HomeScore']
+            actual_away_score = g['AwayScore']
+            actual_margin = actual_home_score - actual_away_score
+            actual_winner = home if actual_home_score > actual_away_score else away
+
+            h_rest = g.get('HomeRest', 7) or 7
+            a_rest = g.get('AwayRest', 7) or 7
+            vegas = g.get('spread_line', 0.0)
+
+            p = predictor.predict_matchup(home, away, home_rest=int(h_rest), away_rest=int(a_rest),
+                                          home_qb=g.get('home_qb_name'), away_qb=g.get('away_qb_name'),
+                                          vegas_line=float(vegas))
+
+            pred_spread = p['EstimatedSpread']
+            pred_winner = home if pred_spread < 0 else away
+
+            record = {
+                'Season': g['Season'],
+                'Week': g['Week'],
+                'GameKey': g.get('GameKey'),
+                'HomeTeam': home,
+                'AwayTeam': away,
+                'HomeScore': actual_home_score,
+                'AwayScore': actual_away_score,
+                'ActualMargin': actual_margin,
+                'ActualWinner': actual_winner,
+                'PredSpread': pred_spread,
+                'PredWinner': pred_winner,
+                'HomeWinProb': p.get('HomeWinProbability'),
+                'Correct': pred_winner == actual_winner,
+                'SpreadError': abs(pred_spread - (-actual_margin)),
+                'spread_line': vegas,
+                'HomeRest': int(h_rest),
+                'AwayRest': int(a_rest),
+                'HomeTurnovers': g.get('home_turnovers', np.nan),
+                'AwayTurnovers': g.get('away_turnovers', np.nan),
+                'HomeRushEPA': g.get('home_rush_epa', np.nan),
+                'AwayRushEPA': g.get('away_rush_epa', np.nan),
+                'HomePassEPA': g.get('home_pass_epa', np.nan),
+                'AwayPassEPA': g.get('away_pass_epa', np.nan),
+                'Roof': g.get('roof') or 'unknown',
+                'Surface': g.get('surface') or 'unknown',
+                'Temp': g.get('temp', np.nan),
+                'Wind': g.get('wind', np.nan),
+            }
+            if models is not None:
+                record.update(WalkForwardBacktest.model_diffs(models, g))
+            records.append(record)
+        return records
+
+
+def summarize(records: List[Dict]) -> Dict:
+    total_games = len(records)
+    correct_picks = sum(1 for r in records if r['Correct'])
+    ae_spread = sum(r['SpreadError'] for r in records)
+
+    contrarian_wins = 0
+    contrarian_losses = 0
+    for r in records:
+        vegas = r['spread_line']
+        if vegas == 0.0:
+            continue
+        if r['PredSpread'] < 0 and vegas > 0:
+            if r['ActualWinner'] == r['HomeTeam']: contrarian_wins += 1
+            else: contrarian_losses += 1
+        elif r['PredSpread'] > 0 and vegas < 0:
+            if r['ActualWinner'] == r['AwayTeam']: contrarian_wins += 1
+            else: contrarian_losses += 1
+
+    weeks = [r['Week'] for r in records]
+    return {
+        'first_week': min(weeks) if weeks else None,
+        'last_week': max(weeks) if weeks else None,
+        'games': total_games,
+        'correct': correct_picks,
+        'accuracy': correct_picks / total_games if total_games else None,
+        'mean_spread_error': ae_spread / total_games if total_games else None,
+        'contrarian_wins': contrarian_wins,
+        'contrarian_losses': contrarian_losses,
+    }
+
+
+_worker_schedules: Dict[int, List[Dict]] = {}
+_worker_handles: Dict[int, Dict] = {}
+
+
+def _init_worker(handles: Dict[int, Dict]):
+    _worker_handles.update(handles)
+
+
+def _load_schedule(season: int) -> List[Dict]:
+    from src.data.client import NFLVerseClient
+    return NFLVerseClient().get_schedules(season)
+
+
+def _schedule_columns(season: int) -> Dict[str, np.ndarray]:
+    from src.data.client import NFLVerseClient
+    columns = NFLVerseClient().schedule_columns(season)
+    return columns if columns is not None else shared.table_columns(_load_schedule(season))
+
+
+def _season_schedule(season: int) -> List[Dict]:
+    if season not in _worker_schedules:
+        if season in _worker_handles:
+            _worker_schedules[season] = shared.table_records(shared.attach(_worker_handles[season]))
+            shared.detach(_worker_handles[season]['name'])
+        else:
+            _worker_schedules[season] = _load_schedule(season)
+    return _worker_schedules[season]
+
+
+def backtest_cache() -> DiskCache:
+    return DiskCache('backtest')
+
+
+def _run_job(season: int, config: ModelConfig, keep_records: bool = False, use_cache: bool = True) -> Dict:
+    start = time.perf_counter()
+    schedule = _season_schedule(season)
+    backtest = WalkForwardBacktest(schedule, season, model_factory=config,
+                                   predictor_factory=config_predictor, verbose=False)
+    records = backtest.run(cache=backtest_cache() if use_cache else None)
+    result = {'Season': season, 'Config': config.name}
+    result.update(summarize(records))
+    result['cache_hits'] = backtest.cache_hits
+    result['cache_misses'] = backtest.cache_misses
+    result['seconds'] = time.perf_counter() - start
+    result['worker'] = os.getpid()
+    if keep_records:
+        for r in records:
+            r['Config'] = config.name
+        result['records'] = records
+    return result
+
+
+def _map_jobs(seasons: Iterable[int], configs: Iterable[ModelConfig], max_workers: Optional[int],
+              keep_records: bool, use_cache: bool) -> List[Dict]:
+    seasons = sorted(set(seasons))
+    jobs = [(season, config) for season in seasons for config in configs]
+    results = []
+
+    with shared.SharedTables() as tables:
+        handles = {season: tables.publish(f"schedule_{season}", _schedule_columns(season)) for season in seasons}
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(handles,)) as pool:
+            futures = {pool.submit(_run_job, season, config, keep_records, use_cache): (season, config.name) for season, config in jobs}
+            for future in as_completed(futures):
+                season, name = futures[future]
+                try:
+                    results.append(future.result())
+                    logger.info(f"Backtest {season}/{name} finished")
+                except Exception as e:
+                    logger.error(f"Backtest {season}/{name} failed: {e}")
+
+    return sorted(results, key=lambda r: (r['Season'], r['Config']))
+
+
+def run_backtests(seasons: Iterable[int], configs: Iterable[ModelConfig], max_workers: Optional[int] = None,
+                  use_cache: bool = True) -> pd.DataFrame:
+    rows = _map_jobs(seasons, configs, max_workers, keep_records=False, use_cache=use_cache)
+    return pd.DataFrame(rows).reset_index(drop=True) if rows else pd.DataFrame()
+
+
+def run_prediction_table(seasons: Iterable[int], configs: Iterable[ModelConfig],
+                         max_workers: Optional[int] = None, use_cache: bool = True) -> pd.DataFrame:
+    records = []
+    for result in _map_jobs(seasons, configs, max_workers, keep_records=True, use_cache=use_cache):
+        records.extend(result['records'])
+    return prediction_table(records)
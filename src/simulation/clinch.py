@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Set, Tuple
+
+WILD_CARDS = 3
+
+
+def clinch_status(standings: Dict[str, Dict], pending_games: List[Dict], divisions: Dict[str, str],
+                  conferences: Dict[str, List[str]]) -> pd.DataFrame:
+    teams = list(standings)
+    index = {t: i for i, t in enumerate(teams)}
+
+    wins = np.array([standings[t]['Wins'] for t in teams], dtype=float)
+    losses = np.array([standings[t]['Losses'] for t in teams], dtype=float)
+    ties = np.array([standings[t]['Ties'] for t in teams], dtype=float)
+    remaining = np.zeros(len(teams))
+    for g in pending_games:
+        for side in ('HomeTeam', 'AwayTeam'):
+            if g[side] in index:
+                remaining[index[g[side]]] += 1
+
+    total = wins + losses + ties + remaining
+    safe_total = np.where(total > 0, total, 1.0)
+    min_pct = (wins + 0.5 * ties) / safe_total
+    max_pct = (wins + 0.5 * ties + remaining) / safe_total
+
+    conference_of = {t: conf for conf, members in conferences.items() for t in members}
+    conf = np.array([conference_of.get(t) for t in teams], dtype=object)
+    div = np.array([divisions.get(t) for t in teams], dtype=object)
+    div_codes, div_names = pd.factorize(div)
+
+    same_conf = (conf[:, None] == conf[None, :]) & (conf[:, None] != None)
+    same_div = (div[:, None] == div[None, :]) & (div[:, None] != None)
+    others = ~np.eye(len(teams), dtype=bool)
+
+    can_reach = others & (max_pct[None, :] >= min_pct[:, None])
+    sure_above = others & (min_pct[None, :] > max_pct[:, None])
+
+    clinched_division = (div != None) & ~np.any(same_div & others & can_reach, axis=1)
+    eliminated_division = np.any(same_div & sure_above, axis=1)
+
+    onehot = np.zeros((len(teams), len(div_names)))
+    has_div = div_codes >= 0
+    onehot[np.flatnonzero(has_div), div_codes[has_div]] = 1.0
+    threats = (same_conf & can_reach).astype(float) @ onehot
+    worst_case_above = np.maximum(threats - 1, 0).sum(axis=1)
+    clinched_playoffs = clinched_division | (worst_case_above <= WILD_CARDS - 1)
+
+    certain = (same_conf & sure_above).astype(float) @ onehot
+    best_case_above = np.maximum(certain - 1, 0).sum(axis=1)
+    eliminated = eliminated_division & (best_case_above >= WILD_CARDS)
+
+    status = np.where(clinched_division, 'CLINCHED_DIVISION',
+                      np.where(clinched_playoffs, 'CLINCHED_PLAYOFFS',
+                               np.where(eliminated, 'ELIMINATED', 'ALIVE')))
+
+    return pd.DataFrame({
+        'Team': teams,
+        'Conference': conf,
+        'Division': div,
+        'Wins': wins.astype(int),
+        'Losses': losses.astype(int),
+        'Ties': ties.astype(int),
+        'Remaining': remaining.astype(int),
+        'MinPct': min_pct,
+        'MaxPct': max_pct,
+        'ClinchedDivision': clinched_division,
+        'ClinchedPlayoffs': clinched_playoffs,
+        'EliminatedDivision': eliminated_division,
+        'Eliminated': eliminated,
+        'Status': status,
+    })
+
+
+def decided_games(pending_games: List[Dict], eliminated: Set[str]) -> Tuple[List[Dict], List[Dict]]:
+    influential = {t for g in pending_games for t in (g['HomeTeam'], g['AwayTeam']) if t not in eliminated}
+    contested = []
+    decided = []
+    for g in reversed(pending_games):
+        teams = (g['HomeTeam'], g['AwayTeam'])
+        if any(t in influential for t in teams):
+            influential.update(teams)
+            contested.append(g)
+        else:
+            decided.append(g)
+    return contested[::-1], decided[::-1]
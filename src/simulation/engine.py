@@ -1,9 +1,14 @@
 import random
 import copy
 import logging
+import numpy as np
+import pandas as pd
 from typing import List, Dict
 from src.models.predictor import GamePredictor
+from src.data.games import GameTable
 from src.simulation.rules import SeasonRules
+from src.simulation.win_totals import outcome_distributions, win_total_table
+from src.simulation.clinch import clinch_status, decided_games
 
 logger = logging.getLogger(__name__)
 
@@ -20,19 +25,15 @@ class SeasonSimulator:
             if conf in self.conferences:
                 self.conferences[conf].append(t['Key'])
                 
+        self.table = GameTable.from_records(games)
         self.primary_qbs = {}
-        sorted_games = sorted(games, key=lambda x: x['Week'], reverse=True)
-        for g in sorted_games:
-            h = g['HomeTeam']
-            a = g['AwayTeam']
-            hq = g.get('home_qb_name')
-            aq = g.get('away_qb_name')
+        latest = np.argsort(-self.table.week, kind='stable')
+        columns = (self.table.column(name, latest) for name in ('HomeTeam', 'AwayTeam', 'home_qb_name', 'away_qb_name'))
+        for h, a, hq, aq in zip(*columns):
             if h not in self.primary_qbs and hq: self.primary_qbs[h] = hq
             if a not in self.primary_qbs and aq: self.primary_qbs[a] = aq
             
-    def simulate(self, n_simulations: int = 1000, start_week: int = None) -> Dict:
-        logger.info(f"Starting {n_simulations} simulations from Week {start_week if start_week else 'Current'}...")
-        
+    def _split_games(self, start_week: int = None):
         completed_games = []
         pending_games = []
         
@@ -49,7 +50,10 @@ class SeasonSimulator:
                 completed_games.append(game)
             else:
                 pending_games.append(game)
-                
+        
+        return completed_games, pending_games
+
+    def _base_standings(self, completed_games: List[Dict]) -> Dict:
         base_standings = {ticker: {'Wins': 0, 'Losses': 0, 'Ties': 0} for ticker in self.teams_map}
         
         for game in completed_games:
@@ -64,16 +68,55 @@ class SeasonSimulator:
             
             SeasonRules.update_standings(base_standings, home, away, winner)
         
-        team_results = {t: {'MadePlayoffs': 0, 'WonDivision': 0, 'WonSuperBowl': 0, 'SeedCounts': {}} for t in self.teams_map}
+        return base_standings
+            
+    def clinch_status(self, start_week: int = None) -> pd.DataFrame:
+        completed_games, pending_games = self._split_games(start_week)
+        return clinch_status(self._base_standings(completed_games), pending_games, self.divisions, self.conferences)
+
+    def simulate(self, n_simulations: int = 1000, start_week: int = None, bootstrap=None, dynamic_ratings: bool = True,
+                 prune: bool = False) -> Dict:
+        logger.info(f"Starting {n_simulations} simulations from Week {start_week if start_week else 'Current'}...")
+        
+        completed_games, pending_games = self._split_games(start_week)
+        base_standings = self._base_standings(completed_games)
+        
+        eliminated = set()
+        decided = []
+        if prune:
+            status = clinch_status(base_standings, pending_games, self.divisions, self.conferences)
+            eliminated = set(status.loc[status['Eliminated'], 'Team'])
+            pending_games, decided = decided_games(pending_games, eliminated)
+            logger.info(f"{status['ClinchedPlayoffs'].sum()} team(s) clinched, {len(eliminated)} eliminated; "
+                        f"{len(decided)} game(s) between eliminated teams drawn without rating updates")
+        
+        team_results = {t: {'MadePlayoffs': 0, 'WonDivision': 0, 'WonSuperBowl': 0, 'SeedCounts': {}, 'WinCounts': {}} for t in self.teams_map}
 
         for i in range(n_simulations):
-            self._run_single_simulation(base_standings, pending_games, team_results)
+            overrides = bootstrap.sample() if bootstrap is not None else None
+            self._run_single_simulation(base_standings, pending_games, team_results, overrides, dynamic_ratings, decided)
             
         return team_results
 
-    def _run_single_simulation(self, base_standings: Dict, pending_games: List[Dict], results: Dict):
-        current_standings = copy.deepcopy(base_standings)
+    def win_totals(self, start_week: int = None, tie_prob: float = 0.0) -> pd.DataFrame:
+        completed_games, pending_games = self._split_games(start_week)
+        base_standings = self._base_standings(completed_games)
+        
+        elo_model = self.original_predictor.elo_model
+        current_ratings = elo_model.ratings.copy() if elo_model is not None else {}
+        get_prob = self._prob_function(current_ratings)
+        
+        team_probs = {t: [] for t in self.teams_map}
+        for game in pending_games:
+            home = game['HomeTeam']
+            away = game['AwayTeam']
+            p_home = get_prob(home, away, game.get('home_qb_name'), game.get('away_qb_name'))
+            team_probs.setdefault(home, []).append(p_home)
+            team_probs.setdefault(away, []).append(1.0 - p_home)
         
+        return win_total_table(outcome_distributions(team_probs, tie_prob), base_standings)
+
+    def _prob_function(self, current_ratings: Dict, overrides: Dict = None):
         has_elo = self.original_predictor.elo_model is not None
         has_pyth = self.original_predictor.pyth_model is not None
         has_srs = self.original_predictor.srs_model is not None
@@ -81,18 +124,15 @@ class SeasonSimulator:
         has_power = self.original_predictor.power_model is not None
         has_qb = self.original_predictor.qb_model is not None
         
-        current_ratings = {}
-        if has_elo:
-            current_ratings = self.original_predictor.elo_model.ratings.copy()
+        overrides = overrides or {}
+        elo_model = overrides.get('elo', self.original_predictor.elo_model)
+        srs_model = overrides.get('srs', self.original_predictor.srs_model)
+        power_model = overrides.get('power', self.original_predictor.power_model)
 
         def get_r(team): 
             if has_elo:
-                 return current_ratings.get(team, self.original_predictor.elo_model.base_rating)
+                 return current_ratings.get(team, elo_model.base_rating)
             return 1500.0
-
-        def update_r(team, new_r):
-            if has_elo:
-                current_ratings[team] = new_r
             
         def get_prob(home, away, h_qb=None, a_qb=None):
             weights = self.original_predictor.weights
@@ -108,11 +148,11 @@ class SeasonSimulator:
             if has_pyth:
                 total_prob += self.original_predictor.pyth_model.get_win_probability(home, away, is_home=True) * weights.get('pyth', 0)
             if has_srs:
-                total_prob += self.original_predictor.srs_model.get_win_probability(home, away, is_home=True) * weights.get('srs', 0)
+                total_prob += srs_model.get_win_probability(home, away, is_home=True) * weights.get('srs', 0)
             if has_form:
                 total_prob += self.original_predictor.form_model.get_win_probability(home, away, is_home=True) * weights.get('form', 0)
             if has_power:
-                total_prob += self.original_predictor.power_model.get_win_probability(home, away, is_home=True) * weights.get('power', 0)
+                total_prob += power_model.get_win_probability(home, away, is_home=True) * weights.get('power', 0)
             
             if has_qb:
                 if h_qb and a_qb:
@@ -123,6 +163,32 @@ class SeasonSimulator:
                 
             return total_prob
 
+        return get_prob
+
+    def _run_single_simulation(self, base_standings: Dict, pending_games: List[Dict], results: Dict, overrides: Dict = None,
+                               dynamic_ratings: bool = True, decided: List = ()):
+        current_standings = copy.deepcopy(base_standings)
+        
+        has_elo = self.original_predictor.elo_model is not None
+        elo_model = (overrides or {}).get('elo', self.original_predictor.elo_model)
+        
+        current_ratings = {}
+        if has_elo:
+            current_ratings = elo_model.ratings.copy()
+
+        def get_r(team): 
+            if has_elo:
+                 return current_ratings.get(team, elo_model.base_rating)
+            return 1500.0
+
+        def update_r(team, new_r):
+            if has_elo and dynamic_ratings:
+                current_ratings[team] = new_r
+            
+        get_prob = self._prob_function(current_ratings, overrides)
+        decided_probs = [(g['HomeTeam'], g['AwayTeam'], get_prob(g['HomeTeam'], g['AwayTeam'], g.get('home_qb_name'), g.get('away_qb_name')))
+                         for g in decided]
+
         for game in pending_games:
             home = game['HomeTeam']
             away = game['AwayTeam']
@@ -150,6 +216,14 @@ class SeasonSimulator:
             
             SeasonRules.update_standings(current_standings, home, away, winner)
             
+        for home, away, p_home in decided_probs:
+            SeasonRules.update_standings(current_standings, home, away, home if random.random() < p_home else away)
+        
+        for team, record in current_standings.items():
+            if team in results:
+                counts = results[team]['WinCounts']
+                counts[record['Wins']] = counts.get(record['Wins'], 0) + 1
+        
         seeds = SeasonRules.determine_seeds(current_standings, self.divisions, self.conferences)
         
         for conf, seed_list in seeds.items():
@@ -46,3 +46,45 @@ class Evaluator:
             print(f"\n{conf} PROJECTIONS")
             print(df[df['Conference'] == conf][cols].to_string(index=False))
             print("-" * 55)
+
+    @staticmethod
+    def print_win_totals(table: pd.DataFrame, teams_map: Dict, line: float = None):
+        from src.simulation.win_totals import expected_wins, over_under
+        
+        modal = table.loc[table.groupby('Team', sort=False)['Prob'].idxmax()]
+        modal = modal.assign(**{'Most Likely': [f"{w}-{l}" + (f"-{t}" if t else "") for w, l, t in zip(modal['Wins'], modal['Losses'], modal['Ties'])]})
+        
+        df = expected_wins(table).merge(modal[['Team', 'Most Likely']], on='Team')
+        df['Exp Wins'] = df['ExpWins'].round(2)
+        df['Conference'] = df['Team'].map(lambda t: teams_map.get(t, {}).get('Conference', '-'))
+        cols = ['Team', 'Exp Wins', 'Most Likely']
+        
+        if line is not None:
+            odds = over_under(table, line)
+            df = df.merge(odds[['Team', 'Over', 'Under']], on='Team')
+            df[f'Over {line}'] = (df['Over'] * 100).round(1)
+            df[f'Under {line}'] = (df['Under'] * 100).round(1)
+            cols += [f'Over {line}', f'Under {line}']
+        
+        df = df.sort_values('ExpWins', ascending=False)
+        
+        print("\n=== EXACT WIN TOTALS (Poisson-Binomial) ===")
+        print("-" * 55)
+        for conf in ['AFC', 'NFC']:
+            print(f"\n{conf} WIN TOTALS")
+            print(df[df['Conference'] == conf][cols].to_string(index=False))
+            print("-" * 55)
+
+    @staticmethod
+    def print_clinch_status(table: pd.DataFrame, teams_map: Dict):
+        df = table.assign(Record=[f"{w}-{l}" + (f"-{t}" if t else "") for w, l, t in zip(table['Wins'], table['Losses'], table['Ties'])],
+                          Division=table['Team'].map(lambda t: teams_map.get(t, {}).get('Division', '-')))
+        df = df.sort_values(['MaxPct', 'MinPct'], ascending=False)
+        cols = ['Team', 'Division', 'Record', 'Remaining', 'Status']
+        
+        print("\n=== CLINCH / ELIMINATION STATUS ===")
+        print("-" * 55)
+        for conf in ['AFC', 'NFC']:
+            print(f"\n{conf}")
+            print(df[df['Conference'] == conf][cols].to_string(index=False))
+            print("-" * 55)
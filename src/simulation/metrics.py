@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+from src.utils.upsets import UpsetDetector
+
+EPS = 1e-15
+
+
+def prediction_table(records: List[Dict]) -> pd.DataFrame:
+    df = pd.DataFrame(records)
+    if df.empty:
+        return df
+
+    margin = df['HomeScore'].to_numpy(dtype=float) - df['AwayScore'].to_numpy(dtype=float)
+    prob = df['HomeWinProb'].to_numpy(dtype=float)
+    pred_spread = df['PredSpread'].to_numpy(dtype=float)
+    line = df['spread_line'].to_numpy(dtype=float)
+
+    outcome = np.where(margin > 0, 1.0, np.where(margin < 0, 0.0, 0.5))
+    clipped = np.clip(prob, EPS, 1 - EPS)
+
+    df['HomeWon'] = outcome
+    df['Brier'] = (prob - outcome) ** 2
+    df['LogLoss'] = -(outcome * np.log(clipped) + (1 - outcome) * np.log(1 - clipped))
+
+    cover_margin = margin + line
+    has_line = ~np.isnan(line)
+    pick_home = pred_spread < line
+    pick_away = pred_spread > line
+    df['ATSPick'] = np.where(~has_line, None, np.where(pick_home, 'HOME', np.where(pick_away, 'AWAY', None)))
+    df['ATSPush'] = has_line & (cover_margin == 0)
+    df['ATSWin'] = has_line & ((pick_home & (cover_margin > 0)) | (pick_away & (cover_margin < 0)))
+    df['ATSLoss'] = has_line & ((pick_home & (cover_margin < 0)) | (pick_away & (cover_margin > 0)))
+
+    if 'HomeRest' in df.columns:
+        df['TrapRisk'], df['TrapGame'] = UpsetDetector().trap_scores(
+            df['HomeTeam'], df['AwayTeam'], np.nan_to_num(line), df['HomeRest'], df['AwayRest'], df['Week'])
+
+    return df
+
+
+def _aggregate(grouped) -> pd.DataFrame:
+    out = grouped.agg(
+        games=('Correct', 'size'),
+        correct=('Correct', 'sum'),
+        brier=('Brier', 'mean'),
+        log_loss=('LogLoss', 'mean'),
+        mean_spread_error=('SpreadError', 'mean'),
+        ats_wins=('ATSWin', 'sum'),
+        ats_losses=('ATSLoss', 'sum'),
+        ats_pushes=('ATSPush', 'sum'),
+    )
+    out['accuracy'] = out['correct'] / out['games']
+    decided = out['ats_wins'] + out['ats_losses']
+    out['ats_win_rate'] = np.where(decided > 0, out['ats_wins'] / decided.where(decided > 0, 1), np.nan)
+    return out.reset_index()
+
+
+def summary(df: pd.DataFrame, by: List[str]) -> pd.DataFrame:
+    return _aggregate(df.groupby(by, sort=True))
+
+
+def weekly_breakdown(df: pd.DataFrame) -> pd.DataFrame:
+    keys = [c for c in ('Config', 'Season', 'Week') if c in df.columns]
+    return summary(df, keys)
+
+
+def calibration_bins(df: pd.DataFrame, n_bins: int = 10) -> pd.DataFrame:
+    edges = np.linspace(0.0, 1.0, n_bins + 1)
+    prob = df['HomeWinProb'].to_numpy(dtype=float)
+    idx = np.clip(np.digitize(prob, edges[1:-1]), 0, n_bins - 1)
+
+    keys = [c for c in ('Config',) if c in df.columns]
+    binned = df.assign(Bin=idx)
+    out = binned.groupby(keys + ['Bin']).agg(
+        games=('HomeWon', 'size'),
+        mean_predicted=('HomeWinProb', 'mean'),
+        observed=('HomeWon', 'mean'),
+    ).reset_index()
+    out['bin_lo'] = edges[out['Bin'].to_numpy()]
+    out['bin_hi'] = edges[out['Bin'].to_numpy() + 1]
+    out['gap'] = out['observed'] - out['mean_predicted']
+    return out
+
+
+def backtest_report(df: pd.DataFrame, n_bins: int = 10) -> Dict[str, pd.DataFrame]:
+    keys = [c for c in ('Config', 'Season') if c in df.columns]
+    overall_keys = [c for c in ('Config',) if c in df.columns]
+
+    overall = summary(df.assign(Season='ALL'), overall_keys + ['Season'])
+    by_season = summary(df, keys) if keys else overall
+
+    return {
+        'seasons': pd.concat([by_season.astype({'Season': str}), overall], ignore_index=True),
+        'weeks': weekly_breakdown(df),
+        'calibration': calibration_bins(df, n_bins),
+    }
@@ -0,0 +1,81 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+from src.utils.upsets import UpsetDetector
+
+logger = logging.getLogger(__name__)
+
+PREDICTION_COLUMNS = ['Season', 'Week', 'GameKey', 'HomeTeam', 'AwayTeam', 'HomeQB', 'AwayQB', 'HomeRest', 'AwayRest',
+                      'HomeWinProb', 'AwayWinProb', 'PredSpread', 'PredHomeScore', 'PredAwayScore', 'HomeRating',
+                      'AwayRating', 'VegasLine', 'VegasDiff', 'PredWinner', 'Contrarian', 'TrapGame']
+
+
+def _rest(value) -> int:
+    return int(value) if value is not None else 7
+
+
+def predict_week(games: List[Dict], predictor, upset_detector: Optional[UpsetDetector] = None) -> pd.DataFrame:
+    upset_detector = upset_detector or UpsetDetector()
+    rows = []
+    for game in games:
+        home = game['HomeTeam']
+        away = game['AwayTeam']
+        h_rest = _rest(game.get('HomeRest', 7))
+        a_rest = _rest(game.get('AwayRest', 7))
+        vegas_line = float(game.get('spread_line', 0.0) or 0.0)
+
+        pred = predictor.predict_matchup(home, away, is_neutral=False,
+                                         home_rest=h_rest, away_rest=a_rest,
+                                         home_qb=game.get('home_qb_name'), away_qb=game.get('away_qb_name'),
+                                         vegas_line=vegas_line)
+        rows.append({
+            'Season': game.get('Season'),
+            'Week': game.get('Week'),
+            'GameKey': game.get('GameKey'),
+            'HomeTeam': home,
+            'AwayTeam': away,
+            'HomeQB': game.get('home_qb_name'),
+            'AwayQB': game.get('away_qb_name'),
+            'HomeRest': h_rest,
+            'AwayRest': a_rest,
+            'HomeWinProb': pred['HomeWinProbability'],
+            'PredSpread': pred['EstimatedSpread'],
+            'PredHomeScore': pred['PredictedHomeScore'],
+            'PredAwayScore': pred['PredictedAwayScore'],
+            'HomeRating': pred.get('HomeRating'),
+            'AwayRating': pred.get('AwayRating'),
+            'VegasLine': vegas_line,
+        })
+
+    if not rows:
+        return pd.DataFrame(columns=PREDICTION_COLUMNS)
+
+    df = pd.DataFrame(rows)
+    spread = df['PredSpread'].to_numpy(dtype=float)
+    vegas = df['VegasLine'].to_numpy(dtype=float)
+
+    df['AwayWinProb'] = 1.0 - df['HomeWinProb']
+    df['VegasDiff'] = spread - vegas
+    df['PredWinner'] = np.where(spread < 0, df['HomeTeam'], df['AwayTeam'])
+    df['Contrarian'] = ((spread < 0) & (vegas > 0)) | ((spread > 0) & (vegas < 0))
+    _, df['TrapGame'] = upset_detector.trap_scores(df['HomeTeam'], df['AwayTeam'], vegas,
+                                                   df['HomeRest'], df['AwayRest'], df['Week'].fillna(1))
+    return df[PREDICTION_COLUMNS]
+
+
+def export_predictions(df: pd.DataFrame, path: str) -> None:
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        if ext == '.json':
+            df.to_json(path, orient='records', indent=4)
+        elif ext == '.csv':
+            df.to_csv(path, index=False)
+        elif ext == '.parquet':
+            df.to_parquet(path, index=False)
+        else:
+            raise ValueError(f"Unsupported export format '{ext}' (use .json, .csv or .parquet)")
+        logger.info(f"Saved {len(df)} predictions to {path}")
+    except Exception as e:
+        logger.error(f"Failed to export predictions to {path}: {e}")
@@ -0,0 +1,128 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+from src.config import RESULTS_DIR
+from src.data import storage
+from src.utils.upsets import UpsetDetector
+
+logger = logging.getLogger(__name__)
+
+TEARDOWN_COLUMNS = ['Week', 'Home', 'Away', 'HomeScore', 'AwayScore', 'Margin', 'Predicted_Prob', 'Correct', 'Vegas',
+                    'Elo_Diff', 'QB_Diff', 'EPA_Diff', 'HomeRest', 'AwayRest', 'HomeTurnovers', 'AwayTurnovers', 'Regimes']
+ERROR_COLUMNS = TEARDOWN_COLUMNS + ['TO_Winner', 'Actual_Winner']
+STATISTICAL_COLUMNS = ['Week', 'Home', 'Away', 'HomeScore', 'AwayScore', 'Margin', 'PredProb', 'Confidence', 'Vegas',
+                       'HomeRest', 'AwayRest', 'Temp', 'Wind', 'Roof', 'Surface', 'HomeTurnovers', 'AwayTurnovers',
+                       'HomeRushEPA', 'AwayRushEPA', 'HomePassEPA', 'AwayPassEPA']
+MISSED_COLUMNS = ['Week', 'Home', 'Away', 'Predicted', 'Actual', 'PredProb', 'VegasLine', 'Margin', 'HomeScore',
+                  'AwayScore', 'HomeRest', 'AwayRest', 'Roof', 'Surface', 'Temp', 'Wind', 'HomeTurnovers',
+                  'AwayTurnovers', 'HomeRushEPA', 'AwayRushEPA', 'HomePassEPA', 'AwayPassEPA']
+
+TEARDOWN_FILES = {
+    'complete_teardown': TEARDOWN_COLUMNS,
+    'errors_detailed': ERROR_COLUMNS,
+    'statistical_misses': STATISTICAL_COLUMNS,
+    'missed_games_full': MISSED_COLUMNS,
+}
+
+
+def team_divisions() -> Dict[str, str]:
+    teams = storage.load_json("teams_nflverse.json") or []
+    divisions = {t['Key']: t['Division'] for t in teams if t.get('Division')}
+    return divisions or UpsetDetector().divisions
+
+
+def regime_masks(df: pd.DataFrame, divisions: Optional[Dict[str, str]] = None) -> Dict[str, np.ndarray]:
+    divisions = divisions or team_divisions()
+    spread = np.abs(df['spread_line'].to_numpy(dtype=float))
+    week = df['Week'].to_numpy()
+    rest_gap = np.abs(df['HomeRest'].to_numpy(dtype=float) - df['AwayRest'].to_numpy(dtype=float))
+    home_div = df['HomeTeam'].map(divisions)
+    away_div = df['AwayTeam'].map(divisions)
+
+    return {
+        'CLOSE_GAME': spread < 3,
+        'MEDIUM_SPREAD': (spread >= 3) & (spread < 7),
+        'BLOWOUT_EXPECTED': spread >= 7,
+        'DIVISION_GAME': (home_div.notna() & (home_div == away_div)).to_numpy(),
+        'EARLY_SEASON': week <= 4,
+        'MID_SEASON': (week > 4) & (week <= 12),
+        'LATE_SEASON': week > 12,
+        'MAJOR_REST_ADVANTAGE': rest_gap >= 3,
+        'MINOR_REST_ADVANTAGE': (rest_gap >= 1) & (rest_gap < 3),
+    }
+
+
+def regime_labels(masks: Dict[str, np.ndarray]) -> np.ndarray:
+    labels = None
+    for name, mask in masks.items():
+        tag = np.where(mask, name + ',', '')
+        labels = tag if labels is None else np.char.add(labels, tag)
+    return np.char.rstrip(labels, ',')
+
+
+def _turnover_winner(home_to: np.ndarray, away_to: np.ndarray) -> np.ndarray:
+    return np.where(home_to < away_to, 'HOME', np.where(away_to < home_to, 'AWAY', 'EVEN'))
+
+
+def teardown_tables(df: pd.DataFrame, divisions: Optional[Dict[str, str]] = None) -> Dict[str, pd.DataFrame]:
+    if df.empty:
+        return {name: pd.DataFrame(columns=cols) for name, cols in TEARDOWN_FILES.items()}
+
+    keys = [c for c in ('Config', 'Season') if c in df.columns and df[c].nunique() > 1]
+    home_score = df['HomeScore'].to_numpy(dtype=float)
+    away_score = df['AwayScore'].to_numpy(dtype=float)
+    prob = df['HomeWinProb'].to_numpy(dtype=float)
+    home_to = df['HomeTurnovers'].to_numpy(dtype=float)
+    away_to = df['AwayTurnovers'].to_numpy(dtype=float)
+    home_won = home_score > away_score
+    missed = ~df['Correct'].to_numpy(dtype=bool)
+
+    base = df[keys].copy()
+    base['Week'] = df['Week'].to_numpy()
+    base['Home'] = df['HomeTeam'].to_numpy()
+    base['Away'] = df['AwayTeam'].to_numpy()
+    base['HomeScore'] = home_score
+    base['AwayScore'] = away_score
+    base['Margin'] = np.abs(home_score - away_score)
+    base['Predicted_Prob'] = prob
+    base['PredProb'] = prob
+    base['Confidence'] = np.abs(prob - 0.5)
+    base['Correct'] = ~missed
+    base['Vegas'] = df['spread_line'].to_numpy(dtype=float)
+    base['VegasLine'] = base['Vegas']
+    for col in ('Elo_Diff', 'QB_Diff', 'EPA_Diff', 'Temp', 'Wind', 'HomeRushEPA', 'AwayRushEPA', 'HomePassEPA', 'AwayPassEPA'):
+        base[col] = df[col].to_numpy(dtype=float) if col in df.columns else np.nan
+    for col in ('HomeRest', 'AwayRest', 'Roof', 'Surface'):
+        base[col] = df[col].to_numpy()
+    base['HomeTurnovers'] = home_to
+    base['AwayTurnovers'] = away_to
+    base['Regimes'] = regime_labels(regime_masks(df, divisions))
+    base['TO_Winner'] = _turnover_winner(home_to, away_to)
+    base['Actual_Winner'] = np.where(home_won, 'HOME', 'AWAY')
+    base['Predicted'] = df['PredWinner'].to_numpy()
+    base['Actual'] = df['ActualWinner'].to_numpy()
+
+    misses = base[missed]
+    missed_full = misses.assign(PredProb=misses['PredProb'].round(4),
+                                **{c: misses[c].fillna(0.0) for c in ('HomeRushEPA', 'AwayRushEPA', 'HomePassEPA', 'AwayPassEPA')})
+
+    return {
+        'complete_teardown': base[keys + TEARDOWN_COLUMNS].reset_index(drop=True),
+        'errors_detailed': misses[keys + ERROR_COLUMNS].reset_index(drop=True),
+        'statistical_misses': misses[keys + STATISTICAL_COLUMNS].reset_index(drop=True),
+        'missed_games_full': missed_full[keys + MISSED_COLUMNS].reset_index(drop=True),
+    }
+
+
+def write_teardown(tables: Dict[str, pd.DataFrame], directory: str = RESULTS_DIR) -> None:
+    os.makedirs(directory, exist_ok=True)
+    for name, table in tables.items():
+        path = os.path.join(directory, name)
+        try:
+            table.to_csv(f"{path}.csv", index=False)
+            table.to_parquet(f"{path}.parquet", index=False)
+            logger.info(f"Saved {len(table)} rows to {path}.csv/.parquet")
+        except Exception as e:
+            logger.error(f"Failed to save {path}: {e}")
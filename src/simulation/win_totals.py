@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Union
+
+
+def outcome_distributions(team_probs: Dict[str, List[float]], tie_prob: float = 0.0) -> Dict[str, np.ndarray]:
+    teams = list(team_probs)
+    n_games = max((len(p) for p in team_probs.values()), default=0)
+
+    win = np.zeros((len(teams), n_games))
+    active = np.zeros((len(teams), n_games))
+    for i, team in enumerate(teams):
+        probs = team_probs[team]
+        win[i, :len(probs)] = probs
+        active[i, :len(probs)] = 1.0
+
+    tie = tie_prob * active
+    win = win * (1.0 - tie)
+    loss = 1.0 - win - tie
+
+    dist = np.zeros((len(teams), n_games + 1, n_games + 1))
+    dist[:, 0, 0] = 1.0
+    for j in range(n_games):
+        step = dist * loss[:, j, None, None]
+        step[:, 1:, :] += dist[:, :-1, :] * win[:, j, None, None]
+        step[:, :, 1:] += dist[:, :, :-1] * tie[:, j, None, None]
+        dist = step
+
+    return {team: dist[i, :len(team_probs[team]) + 1, :len(team_probs[team]) + 1] for i, team in enumerate(teams)}
+
+
+def win_total_table(distributions: Dict[str, np.ndarray], base_standings: Dict[str, Dict]) -> pd.DataFrame:
+    frames = []
+    for team, dist in distributions.items():
+        base = base_standings.get(team, {'Wins': 0, 'Losses': 0, 'Ties': 0})
+        remaining = dist.shape[0] - 1
+        wins, ties = np.nonzero(dist > 0)
+        frames.append(pd.DataFrame({
+            'Team': team,
+            'Wins': base['Wins'] + wins,
+            'Losses': base['Losses'] + remaining - wins - ties,
+            'Ties': base['Ties'] + ties,
+            'Prob': dist[wins, ties],
+        }))
+
+    if not frames:
+        return pd.DataFrame(columns=['Team', 'Wins', 'Losses', 'Ties', 'Prob'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def expected_wins(table: pd.DataFrame) -> pd.DataFrame:
+    totals = table.assign(WinTotal=(table['Wins'] + 0.5 * table['Ties']) * table['Prob'])
+    return totals.groupby('Team', sort=False)['WinTotal'].sum().rename('ExpWins').reset_index()
+
+
+def over_under(table: pd.DataFrame, lines: Union[float, Dict[str, float]]) -> pd.DataFrame:
+    line = table['Team'].map(lines) if isinstance(lines, dict) else pd.Series(float(lines), index=table.index)
+    total = table['Wins'] + 0.5 * table['Ties']
+    prob = table['Prob']
+
+    out = pd.DataFrame({
+        'Team': table['Team'],
+        'Line': line,
+        'Over': prob.where(total > line, 0.0),
+        'Under': prob.where(total < line, 0.0),
+        'Push': prob.where(total == line, 0.0),
+    })
+    out = out[out['Line'].notna()]
+    return out.groupby(['Team', 'Line'], sort=False)[['Over', 'Under', 'Push']].sum().reset_index()
+
+
+def win_count_gap(table: pd.DataFrame, results: Dict[str, Dict], n_sims: int) -> pd.DataFrame:
+    analytic = table.groupby(['Team', 'Wins'])['Prob'].sum()
+    simulated = pd.Series({(team, wins): count / n_sims
+                           for team, data in results.items()
+                           for wins, count in data.get('WinCounts', {}).items()}, dtype=float)
+    simulated.index.names = ['Team', 'Wins']
+
+    both = pd.concat([analytic.rename('Analytic'), simulated.rename('MonteCarlo')], axis=1).fillna(0.0)
+    both['Gap'] = (both['Analytic'] - both['MonteCarlo']).abs()
+    return both.groupby(level='Team')['Gap'].max().rename('MaxGap').reset_index()
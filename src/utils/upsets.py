@@ -1,3 +1,8 @@
+import numpy as np
+import pandas as pd
+from typing import Tuple
+
+
 class UpsetDetector:
     def __init__(self):
         self.divisions = {
@@ -8,14 +13,40 @@ class UpsetDetector:
             'DAL': 'NFC_East', 'NYG': 'NFC_East', 'PHI': 'NFC_East', 'WAS': 'NFC_East',
             'CHI': 'NFC_North', 'DET': 'NFC_North', 'GB': 'NFC_North', 'MIN': 'NFC_North',
             'ATL': 'NFC_South', 'CAR': 'NFC_South', 'NO': 'NFC_South', 'TB': 'NFC_South',
-            'ARI': 'NFC_West', 'LAR': 'NFC_West', 'SF': 'NFC_West', 'SEA': 'NFC_West'
+            'ARI': 'NFC_West', 'LAR': 'NFC_West', 'LA': 'NFC_West', 'SF': 'NFC_West', 'SEA': 'NFC_West'
         }
+        
+        self.teams = sorted(self.divisions)
+        self.team_index = {t: i for i, t in enumerate(self.teams)}
+        division_of = np.array([self.divisions[t] for t in self.teams] + [None], dtype=object)
+        self.same_division = division_of[:, None] == division_of[None, :]
+
+    def team_codes(self, teams) -> np.ndarray:
+        labels, unique = pd.factorize(teams if isinstance(teams, pd.Series) else np.asarray(teams, dtype=object))
+        unknown = len(self.teams)
+        codes = np.array([self.team_index.get(t, unknown) for t in unique] + [unknown], dtype=np.int64)
+        return codes[labels]
+
+    def trap_scores(self, home_teams, away_teams, vegas_lines, home_rest, away_rest, weeks) -> Tuple[np.ndarray, np.ndarray]:
+        vegas = np.asarray(vegas_lines, dtype=float)
+        h_rest = np.asarray(home_rest, dtype=float)
+        a_rest = np.asarray(away_rest, dtype=float)
+        week = np.asarray(weeks, dtype=float)
+        
+        is_div = self.same_division[self.team_codes(home_teams), self.team_codes(away_teams)]
+        rested_favorite = (vegas < 0) & (h_rest < a_rest)
+        
+        risk = (is_div * 1.0
+                + (is_div & (vegas < -3.0)) * 1.5
+                + rested_favorite * 1.0
+                + (rested_favorite & (h_rest <= 5)) * 2.0
+                + (week <= 3) * 1.0)
+        return risk, risk >= 2.5
 
     def is_trap_game(self, home_team, away_team, vegas_line, home_rest, away_rest, week):
         risk_score = 0
         
         is_div = self.divisions.get(home_team) == self.divisions.get(away_team)
-        
         if is_div:
             risk_score += 1
             if vegas_line < -3.0: